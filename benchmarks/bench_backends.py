@@ -0,0 +1,86 @@
+"""
+Benchmark: pose inference latency / throughput per inference backend.
+
+Loads the model on every requested backend (exporting it into models/ on
+first use, see src/backends.py) and times predict_persons over the same
+frames at batch size 1 and at the multi-camera batch size. Frames come from
+a video file / image when --source is given, otherwise synthetic noise
+(timing only).
+
+Usage:
+    python -m benchmarks.bench_backends [--backends torch,onnx,openvino] [--source clip.mp4]
+                                        [--batch 4] [--repeat 50] [--imgsz 640]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from src.backends import BACKENDS, backend_available, load_backend
+from src.config import INFERENCE_SIZE, MODEL_PATH
+from src.detector import predict_persons
+
+
+def load_frames(source, count, rng):
+    if source is None:
+        return [rng.integers(0, 255, (360, 640, 3), dtype=np.uint8) for _ in range(count)]
+
+    capture = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < count:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    if not frames:
+        raise SystemExit(f"No frames could be read from {source}")
+    return [frames[i % len(frames)] for i in range(count)]
+
+
+def time_backend(model, frames, batch, repeat, imgsz):
+    """Returns (mean latency ms, p95 latency ms, frames per second) for one batch size."""
+    batches = [frames[i:i + batch] for i in range(0, len(frames) - batch + 1, batch)]
+    for _ in range(3):
+        predict_persons(model, batches[0], imgsz)  # Warm-up
+
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        predict_persons(model, batches[i % len(batches)], imgsz)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies = np.array(latencies)
+    return latencies.mean(), np.percentile(latencies, 95), batch * 1000 / latencies.mean()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--source", default=None, help="Video file or image (default: synthetic frames)")
+    parser.add_argument("--batch", type=int, default=4, help="Batch size of the multi-camera run")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--imgsz", type=int, default=INFERENCE_SIZE)
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, max(16, args.batch * 4), np.random.default_rng(0))
+
+    print(f"{'backend':>9} | {'batch':>5} | {'mean (ms)':>9} | {'p95 (ms)':>8} | {'fps':>7}")
+    print("-" * 50)
+    for backend in args.backends.split(","):
+        backend = backend.strip()
+        if backend not in BACKENDS or not backend_available(backend):
+            print(f"{backend:>9} | skipped (runtime not installed)")
+            continue
+
+        model = load_backend(backend, args.model)
+        for batch in sorted({1, args.batch}):
+            mean_ms, p95_ms, fps = time_backend(model, frames, batch, args.repeat, args.imgsz)
+            print(f"{backend:>9} | {batch:>5} | {mean_ms:>9.1f} | {p95_ms:>8.1f} | {fps:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
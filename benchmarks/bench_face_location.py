@@ -0,0 +1,86 @@
+"""
+Benchmark: per-identification latency with and without dlib face detection.
+
+For every image in known_faces/, builds a detector-style face crop (square
+head box padded like ObjectDetector's keypoint face boxes) and times
+face_recognition.face_encodings on it:
+  - detect:  dlib runs its own face detector on the crop (previous behaviour)
+  - known:   the pose-derived face location is passed as known_face_locations
+
+Also reports the encoding distance between both paths (well under the 0.5
+match tolerance means identities are unaffected). Requires face_recognition.
+
+Usage:
+    python -m benchmarks.bench_face_location [--repeat 10] [--faces-dir known_faces]
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+import face_recognition
+
+from src.face_worker import crop_face_location
+from src.keypoints import FACE_PADDING
+
+
+def detector_crop(rgb_img):
+    """Square, padded head crop around the face (mimics the keypoint face box)."""
+    locations = face_recognition.face_locations(rgb_img)
+    if not locations:
+        return None
+    top, right, bottom, left = locations[0]
+    cx, cy = (left + right) // 2, (top + bottom) // 2
+    sq_size = max(right - left, bottom - top)
+    half_size = (sq_size + int(sq_size * FACE_PADDING)) // 2
+    height, width = rgb_img.shape[:2]
+    return rgb_img[max(0, cy - half_size):min(height, cy + half_size),
+                   max(0, cx - half_size):min(width, cx + half_size)].copy()
+
+
+def time_ms(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--faces-dir", default="known_faces")
+    args = parser.parse_args()
+
+    print(f"{'image':<24} | {'crop':>9} | {'detect (ms)':>11} | {'known (ms)':>10} | {'speedup':>7} | {'distance':>8}")
+    print("-" * 84)
+    totals = [0.0, 0.0]
+    for filename in sorted(os.listdir(args.faces_dir)):
+        img = cv2.imread(os.path.join(args.faces_dir, filename))
+        if img is None:
+            continue
+        rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        crop = detector_crop(rgb_img)
+        location = crop_face_location(crop.shape) if crop is not None else None
+        if location is None:
+            print(f"{filename:<24} | no usable face crop")
+            continue
+
+        detect_ms, detect_enc = time_ms(lambda: face_recognition.face_encodings(crop), args.repeat)
+        known_ms, known_enc = time_ms(
+            lambda: face_recognition.face_encodings(crop, known_face_locations=[location]), args.repeat)
+        distance = np.linalg.norm(detect_enc[0] - known_enc[0]) if detect_enc and known_enc else float("nan")
+
+        totals[0] += detect_ms
+        totals[1] += known_ms
+        shape = f"{crop.shape[1]}x{crop.shape[0]}"
+        print(f"{filename:<24} | {shape:>9} | {detect_ms:>11.1f} | {known_ms:>10.1f} | "
+              f"{detect_ms / known_ms:>6.1f}x | {distance:>8.3f}")
+
+    if totals[1]:
+        print(f"{'total':<24} | {'':>9} | {totals[0]:>11.1f} | {totals[1]:>10.1f} | {totals[0] / totals[1]:>6.1f}x |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: per-frame keypoint / ROI evaluation cost vs. number of people.
+
+Compares the previous per-person loop (cv2.pointPolygonTest over the critical
+keypoints + per-person face box math) with the vectorized NumPy pass used by
+ObjectDetector.analyze (cached zone mask lookup + vectorized face boxes).
+Uses synthetic [N, 17, 3] keypoints, so no model or camera is needed. (The
+old path also paid 4 device-to-host copies per person, which are not
+included here.)
+
+Usage:
+    python -m benchmarks.bench_roi_evaluation [--repeat 200]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from src.config import ROI_POINTS
+from src.keypoints import critical_zone_hits, face_boxes
+from src.zones import get_zone_mask
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def legacy_evaluate(kpts, roi_polygon, width, height):
+    """Per-person loop as previously implemented in detect_frame."""
+    results = []
+    for person in kpts:
+        is_breach = False
+        for idx in (0, 9, 10):
+            x, y, conf = person[idx]
+            if conf < 0.5:
+                continue
+            if cv2.pointPolygonTest(roi_polygon, (int(x), int(y)), False) >= 0:
+                is_breach = True
+
+        face = person[0:5]
+        valid = face[face[:, 2] > 0.5]
+        box = None
+        if len(valid) >= 2:
+            x1, y1 = int(np.min(valid[:, 0])), int(np.min(valid[:, 1]))
+            x2, y2 = int(np.max(valid[:, 0])), int(np.max(valid[:, 1]))
+            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+            sq_size = max(x2 - x1, y2 - y1)
+            half_size = (sq_size + int(sq_size * 0.8)) // 2
+            box = (max(0, cx - half_size), max(0, cy - half_size),
+                   min(width, cx + half_size), min(height, cy + half_size))
+        results.append((is_breach, box))
+    return results
+
+
+def vectorized_evaluate(kpts, roi_points, width, height):
+    zone_mask = get_zone_mask(roi_points, width, height)
+    severity = zone_mask.severity(critical_zone_hits(kpts, zone_mask))
+    return severity, face_boxes(kpts, width, height)
+
+
+def random_keypoints(n, rng):
+    kpts = np.empty((n, 17, 3), dtype=np.float32)
+    kpts[..., 0] = rng.uniform(0, WIDTH, (n, 17))
+    kpts[..., 1] = rng.uniform(0, HEIGHT, (n, 17))
+    kpts[..., 2] = rng.uniform(0, 1, (n, 17))
+    return kpts
+
+
+def time_call(func, repeat, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    roi_polygon = np.array([(int(x * WIDTH), int(y * HEIGHT)) for x, y in ROI_POINTS], dtype=np.int32)
+
+    print(f"{'people':>7} | {'loop (us)':>10} | {'vectorized (us)':>15} | {'speedup':>7}")
+    print("-" * 49)
+    for n in (1, 2, 5, 10, 20, 50, 100):
+        kpts = random_keypoints(n, rng)
+        loop_us = time_call(legacy_evaluate, args.repeat, kpts, roi_polygon, WIDTH, HEIGHT)
+        vec_us = time_call(vectorized_evaluate, args.repeat, kpts, ROI_POINTS, WIDTH, HEIGHT)
+        print(f"{n:>7} | {loop_us:>10.1f} | {vec_us:>15.1f} | {loop_us / vec_us:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import time
+from datetime import datetime
+from src.config import ALERT_COOLDOWN, CLIP_FPS, LOGS_DIR, NOTIFY_JPEG_QUALITY, NOTIFY_MAX_WIDTH, PREROLL_SECONDS, logger
+from src.evidence import ClipPolicy, EvidenceWriter, PrerollBuffer, encode_jpeg
+
+
+class AlertManager:
+    """
+    Decision / alerting stage of the detection pipeline:
+    - Keeps detection statistics
+    - Records evidence clips while a breach is active
+    - Sends Telegram alerts (respecting the cooldown)
+
+    One AlertManager is used per camera stream, so cooldowns and evidence
+    clips never mix streams. Has no GUI dependency: user-facing feedback is
+    reported through the optional `on_log(message, level)` and
+    `on_alert(filepath)` callbacks, invoked from the pipeline's decision thread
+    (`on_alert` from the evidence writer thread, once the photo is archived).
+
+    Evidence files are written by an EvidenceWriter (shared between streams
+    when passed in), which keeps the frames it is given: frames must not be
+    modified after they are handed to the AlertManager. Clips follow the
+    capture timestamps of the frames and a ClipPolicy decides when they end.
+    """
+
+    def __init__(self, bot, on_log=None, on_alert=None, alert_cooldown=ALERT_COOLDOWN, camera_name=None,
+                 evidence=None, clip_policy=None):
+        self.bot = bot
+        self.camera_name = camera_name  # Set in multi-camera mode to tag evidence and messages
+        self.on_log = on_log
+        self.on_alert = on_alert
+
+        # Evidence I/O runs off the decision thread
+        self.owns_evidence = evidence is None
+        self.evidence = evidence if evidence is not None else EvidenceWriter()
+
+        # System State - AUTO-ARMED on startup
+        self.armed = True
+        self.alert_cooldown = alert_cooldown
+        self.last_alert_time = 0
+
+        # Recording State (capture timestamps)
+        self.clip = None  # EvidenceWriter clip id
+        self.clip_policy = clip_policy if clip_policy is not None else ClipPolicy()
+        self.last_critical_time = 0
+
+        # Pre-roll: recent frames (sampled at the clip rate) that open the next clip
+        self.preroll = PrerollBuffer() if PREROLL_SECONDS > 0 else None
+        self.last_preroll_time = 0
+        self.recording_start_time = 0
+        self.is_recording = False
+
+        # Authorized Track IDs already reported (identity is cached per track)
+        self.authorized_tracks = set()
+
+        # Statistics
+        self.stats = {
+            'total_detections': 0,
+            'authorized_count': 0,
+            'intruder_count': 0,
+            'alerts_sent': 0
+        }
+
+    def log(self, message, level="info"):
+        if self.on_log:
+            if self.camera_name:
+                message = f"[{self.camera_name}] {message}"
+            self.on_log(message, level)
+
+    def evidence_path(self, timestamp, extension):
+        """Builds the logs/ path for an evidence file"""
+        prefix = f"alert_{self.camera_name}" if self.camera_name else "alert"
+        return LOGS_DIR / f"{prefix}_{timestamp}.{extension}"
+
+    def process(self, result):
+        """Pipeline decision handler: consumes one inference result."""
+        timestamp = result.get("capture_time") or result["timestamp"]
+        if result.get("skipped"):
+            # Not inferred (idle scene): never alerts, only keeps an open clip / the pre-roll going
+            self.record(result["frame"], timestamp)
+            return
+        self.handle_detections(result["detections"], result["status"], result["frame"], timestamp)
+
+    def buffer_preroll(self, frame, timestamp):
+        """Keeps a frame for the pre-roll of the next clip (at most CLIP_FPS frames per second)"""
+        if self.preroll is None or not self.armed:
+            return
+        if timestamp - self.last_preroll_time < 0.9 / CLIP_FPS:  # Small slack for capture jitter
+            return
+        self.last_preroll_time = timestamp
+        self.evidence.add_preroll(self.preroll, timestamp, frame)
+
+    def record(self, frame, timestamp):
+        """Ends the clip when the policy says so, then adds the frame to the clip or the pre-roll"""
+        if self.is_recording and self.clip_policy.should_stop(self.recording_start_time, self.last_critical_time,
+                                                              timestamp):
+            self.stop_recording()
+
+        if self.is_recording and self.clip is not None:
+            self.evidence.write_frame(self.clip, frame, timestamp)
+        else:
+            self.buffer_preroll(frame, timestamp)
+
+    def handle_detections(self, detections, status, frame, timestamp=None):
+        """Process detections, trigger alerts and manage evidence recording"""
+        current_time = time.time()
+        if timestamp is None:
+            timestamp = current_time
+        if status == "CRITICAL":
+            self.last_critical_time = timestamp
+
+        if len(detections) > 0:
+            self.stats['total_detections'] += len(detections)
+
+        for det in detections:
+            name = det.get("name", "Unknown")
+            det_status = det.get("status", "")
+
+            if name != "Unknown" and det_status == "AUTHORIZED":
+                track_id = det.get("track_id", -1)
+                if track_id >= 0 and track_id in self.authorized_tracks:
+                    continue  # Report each authorized track once, not every frame
+                if len(self.authorized_tracks) > 1000:
+                    self.authorized_tracks.clear()
+                self.authorized_tracks.add(track_id)
+
+                self.stats['authorized_count'] += 1
+                self.log(f"Authorized person detected: {name}", "success")
+            elif det_status == "CRITICAL":
+                self.stats['intruder_count'] += 1
+                self.log(f"INTRUDER ALERT - Unidentified person in restricted zone!", "critical")
+
+        # Send Alert - Enhanced with Debug Logging
+        if status == "CRITICAL":
+            logger.debug(f"CRITICAL status detected! Armed={self.armed}")
+
+            if self.armed:
+                # 1. Video Recording Logic
+                if not self.is_recording:
+                    self.start_recording(frame, timestamp)
+
+                # 2. Telegram Alert
+                time_since_last = current_time - self.last_alert_time
+                logger.debug(f"Time since last alert: {time_since_last:.1f}s (Cooldown: {self.alert_cooldown}s)")
+
+                if time_since_last > self.alert_cooldown:
+                    self.send_alert(frame)
+                    self.last_alert_time = current_time
+                else:
+                    remaining = self.alert_cooldown - time_since_last
+                    logger.debug(f"Alert on cooldown. Wait {remaining:.1f}s more")
+            else:
+                logger.debug("Alert NOT sent: System is DISARMED")
+
+        self.record(frame, timestamp)
+
+    def send_alert(self, frame):
+        """Push the evidence photo to Telegram and archive it"""
+        self.log("🚨 Sending Telegram alert with evidence photo...", "critical")
+        logger.warning("CRITICAL SECURITY BREACH DETECTED!")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.evidence_path(timestamp, "jpg")
+
+        msg = f"🚨 SECURITY BREACH 🚨\nTime: {timestamp}\nThreat Level: CRITICAL"
+        if self.camera_name:
+            msg += f"\nCamera: {self.camera_name}"
+
+        # Telegram gets a downscaled copy encoded in memory (no disk round trip);
+        # the full-resolution photo is archived by the evidence writer
+        photo = encode_jpeg(frame, NOTIFY_MAX_WIDTH, NOTIFY_JPEG_QUALITY)
+        if photo is not None:
+            self.queue_alert(photo, msg)
+            self.evidence.write_image(filepath, frame, on_saved=self.alert_saved)
+        else:
+            logger.error("Could not encode the alert photo, sending the archived copy instead.")
+
+            def send_archived(path):
+                self.queue_alert(path, msg)
+                self.alert_saved(path)
+
+            self.evidence.write_image(filepath, frame, on_saved=send_archived)
+
+    def queue_alert(self, photo, msg):
+        """Hands the alert photo to the Telegram delivery queue"""
+        if self.bot.send_alert(photo, msg):
+            self.stats['alerts_sent'] += 1
+            logger.info("Telegram alert queued")
+        else:
+            logger.warning("Telegram alert was not queued (the evidence photo is still archived).")
+
+    def alert_saved(self, filepath):
+        """The evidence photo is archived (evidence writer thread)"""
+        logger.info(f"Evidence saved: {filepath}")
+        if self.on_alert:
+            self.on_alert(filepath)
+
+    def start_recording(self, frame, capture_time=None):
+        """Start recording video clip"""
+        self.is_recording = True
+        self.recording_start_time = capture_time if capture_time is not None else time.time()
+
+        # Create filename (segments alert_..._000.avi, ... listed in alert_....json)
+        timestamp = datetime.fromtimestamp(self.recording_start_time).strftime("%Y%m%d_%H%M%S")
+        filename = self.evidence_path(timestamp, "avi")
+
+        # Initialize Writer (XVID, opened by the evidence writer)
+        h, w = frame.shape[:2]
+        metadata = {'camera': self.camera_name, 'breach': round(self.recording_start_time, 3)}
+        self.clip = self.evidence.open_clip(filename, CLIP_FPS, (w, h), 'XVID', preroll=self.preroll,
+                                            metadata=metadata)
+
+        self.log(f"Started recording evidence...", "warning")
+        logger.info(f"Started recording: {filename.with_suffix('.json')}")
+
+    def stop_recording(self):
+        """Stop recording video"""
+        if self.is_recording:
+            self.is_recording = False
+            if self.clip is not None:
+                self.evidence.close_clip(self.clip)
+                self.clip = None
+            self.log("Evidence recording saved.", "success")
+            logger.info("Recording stopped.")
+
+    def close(self):
+        """Release any open recording (and flush the evidence writer if it is ours)"""
+        self.stop_recording()
+        if self.owns_evidence:
+            self.evidence.close()
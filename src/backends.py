@@ -0,0 +1,94 @@
+import importlib.util
+import shutil
+from pathlib import Path
+from ultralytics import YOLO
+from src.config import INFERENCE_BACKEND, INFERENCE_SIZE, MODEL_PATH, MODELS_DIR, logger
+
+# Inference backends: "torch" runs the .pt model eagerly; the others run a model
+# exported once from it and cached in MODELS_DIR. Exports use dynamic input
+# shapes so batching and ROI-cropped input sizes keep working.
+# "openvino-int8" is never exported implicitly: it is produced (calibrated and
+# validated) with `python -m src.quantize`.
+BACKENDS = {
+    "torch": None,
+    "onnx": {"format": "onnx", "suffix": ".onnx", "runtime": "onnxruntime"},
+    "openvino": {"format": "openvino", "suffix": "_openvino_model", "runtime": "openvino"},
+    "openvino-int8": {"format": "openvino", "suffix": "_int8_openvino_model", "runtime": "openvino", "quantized": True},
+}
+
+
+def backend_available(backend):
+    """Whether the runtime package of a backend is installed."""
+    spec = BACKENDS[backend]
+    return spec is None or importlib.util.find_spec(spec["runtime"]) is not None
+
+
+def exported_model_path(model_path, backend, models_dir=MODELS_DIR):
+    """Cache location of a model exported for a backend, e.g. models/yolov8n-pose.onnx"""
+    return Path(models_dir) / f"{Path(model_path).stem}{BACKENDS[backend]['suffix']}"
+
+
+def export_model(model_path, backend, models_dir=MODELS_DIR, **export_args):
+    """
+    Exports a .pt model for a backend and moves the result into the cache.
+
+    Returns:
+        Path: The exported model (file for ONNX, directory for OpenVINO)
+    """
+    spec = BACKENDS[backend]
+    target = exported_model_path(model_path, backend, models_dir)
+
+    logger.info(f"Exporting {model_path} for the {backend} backend (one-time)...")
+    args = {"format": spec["format"], "imgsz": INFERENCE_SIZE, "dynamic": True, "half": False}
+    args.update(export_args)
+    exported = Path(YOLO(model_path).export(**args))
+
+    if exported.resolve() != target.resolve():
+        if target.is_dir():
+            shutil.rmtree(target)
+        elif target.exists():
+            target.unlink()
+        shutil.move(str(exported), str(target))
+
+    logger.info(f"Exported model cached: {target}")
+    return target
+
+
+def load_backend(backend=INFERENCE_BACKEND, model_path=MODEL_PATH, models_dir=MODELS_DIR):
+    """
+    Loads the pose model on an inference backend, exporting it on first use.
+
+    All backends return an ultralytics YOLO object, so prediction, Results
+    and tracking work the same. Falls back to PyTorch when the backend's
+    runtime is missing or the export fails.
+    """
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown inference backend '{backend}', using torch. Options: {', '.join(BACKENDS)}")
+        backend = "torch"
+
+    if backend != "torch" and not backend_available(backend):
+        logger.warning(f"{BACKENDS[backend]['runtime']} is not installed, using the torch backend.")
+        backend = "torch"
+
+    if backend == "torch":
+        return YOLO(model_path)
+
+    target = exported_model_path(model_path, backend, models_dir)
+    source = Path(model_path)
+    stale = source.exists() and target.exists() and source.stat().st_mtime > target.stat().st_mtime
+
+    if BACKENDS[backend].get("quantized"):
+        if not target.exists():
+            logger.warning(f"No INT8 model at {target} (create it with: python -m src.quantize export), using openvino.")
+            return load_backend("openvino", model_path, models_dir)
+        if stale:
+            logger.warning(f"INT8 model {target} is older than {model_path}; re-run python -m src.quantize export.")
+    elif not target.exists() or stale:
+        try:
+            target = export_model(model_path, backend, models_dir)
+        except Exception as e:
+            logger.error(f"Export for the {backend} backend failed ({e}), using torch.")
+            return YOLO(model_path)
+
+    logger.info(f"Using {backend} inference backend: {target}")
+    return YOLO(str(target), task="pose")
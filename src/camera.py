@@ -0,0 +1,364 @@
+import sys
+import threading
+import time
+import cv2
+import numpy as np
+from src.config import (
+    CAMERA_BUFFER_SIZE, CAMERA_RECONNECT_MAX, CAMERA_RECONNECT_MIN, CAMERA_STALL_TIMEOUT, CAPTURE_FOURCC,
+    CAPTURE_FPS, CAPTURE_HEIGHT, CAPTURE_WIDTH, DETECTION_WIDTH, FRAME_POOL_SIZE, logger
+)
+from src.threads import pin_current_thread
+
+CAPTURE_OPTIONS = {"width": int, "height": int, "fps": int, "fourcc": str, "detect": int}
+
+
+def parse_source(source):
+    """
+    Splits a camera source into the source itself and its capture options.
+
+    Options are appended after '#' as key=value pairs joined by '&', e.g.
+    "rtsp://cam/stream#width=1920&height=1080&fps=15&fourcc=MJPG&detect=640"
+    or "0#fourcc=MJPG". Keys: width, height, fps, fourcc (capture settings,
+    default CAPTURE_*) and detect (detection frame width, default
+    DETECTION_WIDTH, 0 = detect on the full frame). Giving only width or
+    height derives the other from the default CAPTURE_WIDTH:CAPTURE_HEIGHT
+    aspect ratio (16:9), so "#width=1920" requests 1920x1080.
+
+    Returns:
+        tuple: (source (int index or str), options dict)
+    """
+    options = {
+        "width": CAPTURE_WIDTH, "height": CAPTURE_HEIGHT, "fps": CAPTURE_FPS,
+        "fourcc": CAPTURE_FOURCC, "detect": DETECTION_WIDTH
+    }
+
+    if isinstance(source, str) and "#" in source:
+        base, _, suffix = source.rpartition("#")
+        pairs = [pair.split("=", 1) for pair in suffix.split("&") if pair]
+        if pairs and all(len(pair) == 2 and pair[0].strip() in CAPTURE_OPTIONS for pair in pairs):
+            for key, value in pairs:
+                key = key.strip()
+                options[key] = CAPTURE_OPTIONS[key](value.strip())
+            source = base
+
+            given = {key.strip() for key, _ in pairs}
+            if CAPTURE_WIDTH and CAPTURE_HEIGHT:
+                if "width" in given and "height" not in given:
+                    options["height"] = round(options["width"] * CAPTURE_HEIGHT / CAPTURE_WIDTH)
+                elif "height" in given and "width" not in given:
+                    options["width"] = round(options["height"] * CAPTURE_WIDTH / CAPTURE_HEIGHT)
+
+    if isinstance(source, str) and source.strip().isdigit():
+        source = int(source.strip())
+    return source, options
+
+
+# References to a pooled buffer when nothing but the pool holds it (measured, so it
+# follows the interpreter's own counting)
+_probe = [np.empty(0)]
+_FREE_REFS = sys.getrefcount(_probe[0])
+del _probe
+
+
+class FramePool:
+    """
+    A few reusable `out=` buffers for FrameRing.latest() / read_latest().
+
+    Frames handed downstream are annotated in place and held by reference
+    (pipeline queues, GUI, evidence writer), so a buffer is only reused once
+    nothing but the pool references it; when all are busy, latest() allocates
+    a new frame, which the pool keeps while it has room.
+    """
+
+    def __init__(self, size=FRAME_POOL_SIZE):
+        self.size = size
+        self.buffers = []
+
+    def get(self):
+        """Returns a buffer nobody else references, or None (latest() then allocates)."""
+        for index in range(len(self.buffers)):
+            if sys.getrefcount(self.buffers[index]) <= _FREE_REFS:
+                return self.buffers[index]
+        return None
+
+    def keep(self, frame):
+        """Adopts a frame latest() allocated; free buffers of another shape (source resized) are dropped."""
+        if any(buffer is frame for buffer in self.buffers):
+            return
+        self.buffers = [
+            buffer for buffer in self.buffers
+            if buffer.shape == frame.shape or sys.getrefcount(buffer) > _FREE_REFS + 1
+        ]
+        if len(self.buffers) < self.size:
+            self.buffers.append(frame)
+
+
+class FrameRing:
+    """
+    Latest-frame ring buffer with preallocated, reused frame slots.
+
+    The capture thread decodes straight into the next slot and publishes it
+    with a sequence number and a capture timestamp. Readers copy the latest
+    slot out; a copy is retried if the writer wrapped around onto that slot
+    while it was being copied (seqlock-style), so no lock is held during
+    decoding or copying.
+    """
+
+    def __init__(self, size=CAMERA_BUFFER_SIZE):
+        if size < 2:
+            raise ValueError("FrameRing needs at least 2 slots")
+        self.size = size
+        self.slots = [None] * size
+        self.detection_slots = [None] * size  # Downscaled copy of each frame (None when disabled)
+        self.slot_seq = [0] * size  # Sequence number held by each slot (-1 while being written)
+        self.slot_time = [0.0] * size
+
+        self.seq = 0  # Latest published sequence number (0 = no frame yet)
+        self.condition = threading.Condition()
+
+    def next_slot(self):
+        """
+        Returns (index, buffer, detection_buffer) of the slot the writer fills
+        next. Buffers are None until first use.
+        """
+        index = (self.seq + 1) % self.size
+        self.slot_seq[index] = -1
+        return index, self.slots[index], self.detection_slots[index]
+
+    def publish(self, index, frame, timestamp, detection_frame=None):
+        """Publishes the frames written into slot `index` (re-binds the slot if a frame was reallocated)."""
+        self.slots[index] = frame
+        self.detection_slots[index] = detection_frame
+        self.slot_time[index] = timestamp
+        with self.condition:
+            self.slot_seq[index] = self.seq + 1
+            self.seq += 1
+            self.condition.notify_all()
+
+    def latest(self, after_seq=0, out=None):
+        """
+        Copies the latest frame if it is newer than `after_seq`.
+
+        Args:
+            after_seq (int): Last sequence number the caller has seen
+            out (ndarray): Optional buffer to copy into (reused if shape and dtype match)
+
+        Returns:
+            tuple: (seq, timestamp, frame, detection_frame), or (after_seq, None, None, None)
+                   if there is no newer frame. detection_frame is None when downscaling is off.
+        """
+        while True:
+            seq = self.seq
+            if seq <= after_seq:
+                return after_seq, None, None, None
+
+            index = seq % self.size
+            source = self.slots[index]
+            detection_source = self.detection_slots[index]
+            timestamp = self.slot_time[index]
+            if self.slot_seq[index] != seq or source is None:
+                continue  # Writer already wrapped around onto this slot
+
+            if out is None or out.shape != source.shape or out.dtype != source.dtype:
+                out = np.empty_like(source)
+            np.copyto(out, source)
+            detection_frame = detection_source.copy() if detection_source is not None else None
+
+            if self.slot_seq[index] == seq:
+                return seq, timestamp, out, detection_frame
+
+    def wait(self, after_seq=0, timeout=None, out=None):
+        """Blocks until a frame newer than `after_seq` is published (or the timeout expires), then copies it."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > after_seq, timeout)
+        return self.latest(after_seq, out)
+
+
+class ThreadedCamera:
+    """
+    Reads frames in a separate thread to prevent I/O blocking.
+
+    Frames are decoded into a FrameRing, so capture never allocates a new
+    frame; consumers either poll read_latest() or block on wait_for_frame().
+
+    The reader thread also supervises the source: when reads fail or no frame
+    arrives for CAMERA_STALL_TIMEOUT seconds the capture is reopened with
+    exponential backoff (CAMERA_RECONNECT_MIN .. CAMERA_RECONNECT_MAX), and
+    health() reports its state for monitoring. State changes are logged once
+    instead of on every failed read.
+
+    Capture resolution, FPS and FOURCC are configurable per source (see
+    parse_source). Each frame is also downscaled once, at capture time, to a
+    detection-size frame (`detect` option) so inference never touches the
+    full-resolution frame.
+    """
+    def __init__(self, src=0, buffer_size=CAMERA_BUFFER_SIZE):
+        self.src, self.options = parse_source(src)
+        self.ring = FrameRing(buffer_size)
+        self.listeners = []  # Events set on every new frame (multi-camera consumers)
+
+        # Health / supervisor state
+        self.state = "connecting"
+        self.frames = 0
+        self.drops = 0        # Failed reads
+        self.reconnects = 0
+        self.reconnect_delay = CAMERA_RECONNECT_MIN  # Backoff; reset only once a frame is read
+        self.fps = 0.0        # Smoothed capture rate
+        self.last_frame_time = 0.0
+        self.connected_time = time.time()
+
+        self.capture = self._open()
+        self.running = True
+        self._stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._reader, daemon=True)
+        self.thread.start()
+
+    def _open(self):
+        """Opens the source. Network streams get open/read timeouts so a dead stream cannot block forever."""
+        if isinstance(self.src, str) and "://" in self.src:
+            capture = cv2.VideoCapture(self.src, cv2.CAP_ANY, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(CAMERA_STALL_TIMEOUT * 1000),
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(CAMERA_STALL_TIMEOUT * 1000)
+            ])
+        else:
+            capture = cv2.VideoCapture(self.src)
+
+        # FOURCC first: some drivers only offer high resolutions / FPS in MJPG
+        options = self.options
+        if options["fourcc"]:
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*options["fourcc"][:4].ljust(4)))
+        # Default to HD resolution (16:9) to better fill modern screens
+        if options["width"] and options["height"]:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, options["width"])
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, options["height"])
+        if options["fps"]:
+            capture.set(cv2.CAP_PROP_FPS, options["fps"])
+        return capture
+
+    def _downscale(self, frame, buffer):
+        """Resizes a frame to the detection width (into `buffer` when its shape fits), or returns None."""
+        detect_width = self.options["detect"]
+        height, width = frame.shape[:2]
+        if not detect_width or width <= detect_width:
+            return None
+
+        size = (detect_width, max(1, round(height * detect_width / width)))
+        if buffer is None or buffer.shape[:2] != (size[1], size[0]):
+            buffer = None
+        return cv2.resize(frame, size, dst=buffer, interpolation=cv2.INTER_AREA)
+
+    def _set_state(self, state, message=None, level="WARNING"):
+        if state != self.state:
+            self.state = state
+            if message:
+                logger.log(level, f"Camera {self.src}: {message}")
+
+    def _reconnect(self):
+        """
+        Reopens the source, waiting with exponential backoff, until it opens or
+        the camera is released. The backoff keeps growing across calls until a
+        frame is actually read, so a source that opens but never delivers
+        (stalled RTSP stream) is retried less and less often.
+        """
+        self._set_state("reconnecting", "no frames, reconnecting...")
+
+        while self.running:
+            self.capture.release()
+            if self._stop_event.wait(self.reconnect_delay):
+                return
+
+            self.reconnects += 1
+            self.reconnect_delay = min(self.reconnect_delay * 2, CAMERA_RECONNECT_MAX)
+            self.capture = self._open()
+            if self.capture.isOpened():
+                self.connected_time = time.time()
+                return
+
+            logger.warning(f"Camera {self.src}: reconnect failed, retrying in {self.reconnect_delay:.1f}s")
+
+    def _reader(self):
+        pin_current_thread("capture")
+        while self.running:
+            index, buffer, detection_buffer = self.ring.next_slot()
+            ret, frame = self.capture.read(image=buffer)
+            now = time.time()
+
+            if not ret:
+                self.drops += 1
+                if self.state == "streaming":
+                    self._set_state("stalled", "read failed")
+
+                # Reopen once the source has delivered nothing for the stall timeout
+                since = max(self.last_frame_time, self.connected_time)
+                if self.running and now - since > CAMERA_STALL_TIMEOUT:
+                    self._reconnect()
+                else:
+                    self._stop_event.wait(0.1)
+                continue
+
+            if self.state != "streaming":
+                self._set_state("streaming", "streaming", "INFO")
+                self.reconnect_delay = CAMERA_RECONNECT_MIN
+
+            if self.last_frame_time:
+                interval = now - self.last_frame_time
+                if interval > 0:
+                    self.fps = 0.9 * self.fps + 0.1 / interval if self.fps else 1.0 / interval
+            self.last_frame_time = now
+            self.frames += 1
+
+            self.ring.publish(index, frame, now, self._downscale(frame, detection_buffer))
+            for event in self.listeners:
+                event.set()
+
+    def health(self):
+        """
+        Returns:
+            dict: state, fps, frames, drops, reconnects, last_frame_age (seconds, None before the first frame)
+        """
+        state = self.state
+        age = time.time() - self.last_frame_time if self.last_frame_time else None
+        if state == "streaming" and age is not None and age > CAMERA_STALL_TIMEOUT:
+            state = "stalled"  # Reader is blocked inside capture.read()
+        return {
+            "state": state if self.running else "stopped",
+            "fps": round(self.fps, 1),
+            "frames": self.frames,
+            "drops": self.drops,
+            "reconnects": self.reconnects,
+            "last_frame_age": age
+        }
+
+    @property
+    def seq(self):
+        """Sequence number of the latest captured frame (0 before the first frame)."""
+        return self.ring.seq
+
+    def subscribe(self, event):
+        """Registers a threading.Event that is set whenever a new frame is captured."""
+        self.listeners.append(event)
+
+    def read_latest(self, after_seq=0, out=None):
+        """
+        Non-blocking: returns (seq, timestamp, frame, detection_frame) of the
+        latest frame newer than `after_seq`, or (after_seq, None, None, None).
+        """
+        return self.ring.latest(after_seq, out)
+
+    def wait_for_frame(self, after_seq=0, timeout=None, out=None):
+        """Blocking: like read_latest(), but waits up to `timeout` seconds for a newer frame."""
+        return self.ring.wait(after_seq, timeout, out)
+
+    def read(self):
+        """Returns a copy of the latest frame, or None if no frame was captured yet."""
+        return self.ring.latest()[2]
+
+    def release(self):
+        self.running = False
+        self._stop_event.set()
+        # Wake any consumer blocked in wait_for_frame()
+        with self.ring.condition:
+            self.ring.condition.notify_all()
+        self.thread.join(timeout=CAMERA_STALL_TIMEOUT + 1)
+        if self.capture.isOpened():
+            self.capture.release()
@@ -11,6 +11,7 @@ load_dotenv()
 BASE_DIR = Path(__file__).resolve().parent.parent
 LOGS_DIR = BASE_DIR / "logs"
 MODELS_DIR = BASE_DIR / "models"
+KNOWN_FACES_DIR = BASE_DIR / "known_faces"
 
 # Ensure directories exist
 LOGS_DIR.mkdir(exist_ok=True)
@@ -30,6 +31,13 @@ CAMERA_INDEX = os.getenv("CAMERA_INDEX", "0")
 if CAMERA_INDEX.isdigit():
     CAMERA_INDEX = int(CAMERA_INDEX)
 
+# Multi-Camera Mode (Semicolon-separated camera indices, RTSP URLs or video files)
+# All sources share one batched YOLO model. Defaults to the single CAMERA_INDEX source.
+CAMERA_SOURCES = [
+    int(x.strip()) if x.strip().isdigit() else x.strip()
+    for x in os.getenv("CAMERA_SOURCES", "").split(";") if x.strip()
+] or [CAMERA_INDEX]
+
 if not TELEGRAM_TOKEN or TELEGRAM_TOKEN == "your_token_here":
     logger.warning("TELEGRAM_TOKEN is missing or invalid in .env. Telegram notifications will be disabled.")
 
@@ -47,6 +55,21 @@ if not ALLOWED_TELEGRAM_IDS:
 CONFIDENCE_THRESHOLD = 0.6
 ALERT_COOLDOWN = 30  # Seconds
 MODEL_PATH = "yolov8n-pose.pt" 
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")  # torch | onnx | openvino (exported once into models/)
+TRACKER_CONFIG = "botsort.yaml"  # Ultralytics tracker config (botsort.yaml / bytetrack.yaml)
+
+# Face Recognition Config (identities are cached per Track ID and resolved in the background)
+FACE_RECOGNITION_ENABLED = os.getenv("FACE_RECOGNITION", "1") != "0"
+FACE_CHECK_INTERVAL = 5  # Frames between identification retries for Unknown tracks
+IDENTITY_RECHECK_INTERVAL = 150  # Frames between re-verifications of identified tracks
+IDENTITY_MAX_MISSES = 3  # Failed re-verifications before an identified track reverts to Unknown
+IDENTITY_TTL_FRAMES = 30  # Frames a track can go unseen before its cached identity is evicted
+FACE_WORKERS = int(os.getenv("FACE_WORKERS", "2"))  # Identification worker processes (dlib runs outside the GIL)
+FACE_QUEUE_SIZE = 16  # Max queued identification requests (oldest dropped when full)
+FACE_CACHE_PATH = MODELS_DIR / "face_encodings.npz"  # Persistent known_faces encoding cache
+FACE_MATCH_TOLERANCE = 0.5  # Max encoding distance for a match (best match wins)
+FACE_INDEX_THRESHOLD = 2000  # Known encodings from which an approximate (faiss) index is used, if installed
+FACE_KNOWN_LOCATION = True  # Pass the pose-derived face box of frontal faces to dlib instead of re-detecting it
 
 # ROI Config (Normalized 0-1: x, y)
 ROI_POINTS = [
@@ -56,3 +79,81 @@ ROI_POINTS = [
     (0.50, 0.85)   # Bottom-Left
 ]
 
+# Named Zones (Normalized points). Severity "CRITICAL" raises alerts, "WARNING" is only flagged.
+# The default is the single ROI_POINTS "Restricted Area"; at most 16 zones per camera.
+ROI_ZONES = [
+    {"name": "Restricted Area", "points": ROI_POINTS, "severity": "CRITICAL"},
+]
+
+# Per-Stream zone overrides for multi-camera mode: {"cam1": [{"name": ..., "points": ..., "severity": ...}]}
+# Streams are named cam0, cam1, ... in CAMERA_SOURCES order.
+STREAM_ROI_ZONES = {}
+
+ZONE_CACHE_SIZE = 16  # Compiled zone masks kept in memory (one per zone set and frame size)
+
+# ROI-Cropped Inference: run YOLO only on the zones' bounding box (plus a margin)
+ROI_CROP_ENABLED = os.getenv("ROI_CROP", "0") == "1"
+ROI_CROP_MARGIN = 0.15  # Margin around the zones, as a fraction of the frame size (people reach in from outside)
+ROI_CROP_MAX_AREA = 0.8  # Zones covering more of the frame than this are inferred on the full frame
+ROI_FULL_FRAME_INTERVAL = 10  # Every Nth inference of a stream runs on the full frame (keeps tracks alive)
+INFERENCE_SIZE = 640  # Model input size (cropped inference uses the crop size, up to this)
+
+
+# Pipeline Config
+PIPELINE_QUEUE_SIZE = 2  # Max results buffered between pipeline stages (oldest dropped when full)
+FRAME_POOL_SIZE = 8  # Reusable frame buffers per camera for the inference stage (busy ones are never reused)
+DISPLAY_FPS = 20  # Max GUI video refresh rate (independent of the detection rate)
+EVIDENCE_QUEUE_SIZE = 40  # Clip frames waiting for the evidence writer before new ones are dropped
+
+# Telegram Delivery (outbound alert queue)
+NOTIFY_MAX_WIDTH = 960  # Alert photos sent to Telegram are downscaled to this width (0 = full resolution)
+NOTIFY_JPEG_QUALITY = 75  # JPEG quality of the sent photo (the archived copy in logs/ keeps full quality)
+TELEGRAM_QUEUE_SIZE = 50  # Alerts waiting for delivery before the oldest is dropped
+TELEGRAM_BATCH_WINDOW = 1.0  # During a burst, alerts queued within this window go out as one media group (max 10)
+TELEGRAM_CHAT_INTERVAL = 1.0  # Min seconds between messages to one chat (Telegram flood limit)
+TELEGRAM_GROUP_INTERVAL = 3.0  # Same for group chats (20 messages per minute)
+TELEGRAM_MAX_ATTEMPTS = 5  # Send attempts per alert before it is reported as failed
+TELEGRAM_RETRY_MIN = 2.0  # Backoff after a network error (doubles on each retry)
+TELEGRAM_RETRY_MAX = 60.0
+
+# Evidence Clips (timed by capture timestamps: frames are repeated / dropped to play back in real time)
+CLIP_FPS = 20.0  # Frame rate of the evidence clips
+CLIP_MIN_SECONDS = 5.0  # Shortest clip (from the breach)
+CLIP_MAX_SECONDS = 300.0  # Longest clip; a breach still going on starts a new one
+CLIP_SEGMENT_SECONDS = 60.0  # Clips are split into files of this length, listed in a JSON index
+CLIP_MAX_GAP = 2.0  # Capture gaps longer than this (camera stall) are noted in the index, not filled with copies
+PREROLL_SECONDS = 3.0  # Footage kept from before the breach (0 disables the pre-roll)
+POSTROLL_SECONDS = 5.0  # Keep recording this long after the last CRITICAL frame
+PREROLL_MAX_BYTES = 16 * 1024 * 1024  # Pre-roll memory ceiling per camera (JPEG-compressed frames)
+PREROLL_JPEG_QUALITY = 80
+
+# Threading & CPU Affinity (predictable per-stream latency instead of oversubscribed cores)
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "0"))  # torch intra-op threads (0 = library default)
+OPENCV_THREADS = int(os.getenv("OPENCV_THREADS", "-1"))  # -1 = OpenCV default, 0 = single-threaded
+FACE_WORKER_THREADS = 1  # OpenCV / BLAS threads per face encoding process
+# CPU list per stage, e.g. CPU_AFFINITY_INFERENCE=2-5 (empty = not pinned; Linux only)
+CPU_AFFINITY = {
+    stage: os.getenv(f"CPU_AFFINITY_{stage.upper()}", "")
+    for stage in ("capture", "inference", "decision", "face", "encoding", "evidence")
+}
+
+# Motion-gated inference (idle cameras only run YOLO on motion)
+MOTION_GATE_ENABLED = os.getenv("MOTION_GATE", "1") == "1"
+MOTION_WIDTH = 160  # Width of the grayscale frame used for motion detection
+MOTION_PIXEL_DELTA = 25  # Grey-level change for a pixel to count as moving
+MOTION_THRESHOLD = 0.002  # Fraction of moving pixels that counts as motion
+IDLE_INFERENCE_INTERVAL = 2.0  # Seconds between inferences on a static, empty scene
+TRACKED_INFERENCE_STRIDE = 2  # Infer every Nth frame while persons are tracked outside the zones
+ACTIVE_HOLD_SECONDS = 3.0  # Keep inferring every frame this long after a person was in a zone
+ZONE_PROXIMITY_MARGIN = 0.1  # Persons whose box is within this fraction of the frame of the zones get full rate
+CAMERA_BUFFER_SIZE = 3  # Preallocated frame slots per camera ring buffer
+CAMERA_STALL_TIMEOUT = 5.0  # Seconds without a frame before a camera is reopened
+CAMERA_RECONNECT_MIN = 1.0  # First reconnect delay (seconds), doubled after each failed attempt
+CAMERA_RECONNECT_MAX = 30.0  # Reconnect delay ceiling (seconds)
+
+# Capture defaults (override per source with a "#width=..&height=..&fps=..&fourcc=..&detect=.." suffix)
+CAPTURE_WIDTH = 1280
+CAPTURE_HEIGHT = 720
+CAPTURE_FPS = 0  # 0 = driver default
+CAPTURE_FOURCC = os.getenv("CAPTURE_FOURCC", "")  # e.g. "MJPG" for USB cameras; empty = driver default
+DETECTION_WIDTH = int(os.getenv("DETECTION_WIDTH", "640"))  # Width of the frame given to YOLO (0 = full frame)
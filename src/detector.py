@@ -1,172 +1,400 @@
+import math
 import cv2
 import numpy as np
-from ultralytics import YOLO
-from src.config import CONFIDENCE_THRESHOLD, MODEL_PATH, logger
+import torch
+import yaml
+from ultralytics.engine.results import Boxes, Keypoints
+from ultralytics.trackers.bot_sort import BOTSORT
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace
+from ultralytics.utils.checks import check_yaml
+from src.config import (
+    CONFIDENCE_THRESHOLD, FACE_CHECK_INTERVAL, FACE_RECOGNITION_ENABLED, IDENTITY_MAX_MISSES,
+    IDENTITY_RECHECK_INTERVAL, IDENTITY_TTL_FRAMES, INFERENCE_BACKEND, INFERENCE_SIZE, MODEL_PATH, ROI_CROP_ENABLED,
+    ROI_CROP_MARGIN, ROI_CROP_MAX_AREA, ROI_FULL_FRAME_INTERVAL, TRACKER_CONFIG, logger
+)
+from src.backends import load_backend
 from src.face_auth import FaceAuthenticator
+from src.keypoints import critical_zone_hits, face_boxes, frontal_faces
+from src.zones import SEVERITY_LEVELS, ZONE_COLORS, get_zone_mask, zone_bounds
+
+PERSON_CLASSES = [0]  # Class 0 is 'person'
+TRACKER_MAP = {"bytetrack": BYTETracker, "botsort": BOTSORT}
+
+
+def load_model(model_path=MODEL_PATH, backend=INFERENCE_BACKEND):
+    """Loads the YOLO pose model (shared between all streams) on the configured inference backend."""
+    logger.info(f"Loading YOLO model: {model_path}")
+    try:
+        return load_backend(backend, model_path)
+    except Exception as e:
+        logger.error(f"Failed to load model: {e}")
+        raise e
+
+
+def create_tracker(tracker_config=TRACKER_CONFIG, frame_rate=30):
+    """Creates an independent multi-object tracker (one per camera stream)."""
+    with open(check_yaml(tracker_config)) as f:
+        cfg = IterableSimpleNamespace(**yaml.safe_load(f))
+    return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=frame_rate)
+
+
+def predict_persons(model, frames, imgsz=INFERENCE_SIZE):
+    """
+    Runs one batched pose inference over a list of frames.
+    Returns one untracked Results object per frame.
+
+    imgsz: model input size for this call (always passed: the predictor keeps
+    the size of the previous call otherwise)
+    """
+    return model.predict(frames, classes=PERSON_CLASSES, conf=CONFIDENCE_THRESHOLD, imgsz=imgsz, verbose=False)
+
+
+def crop_input_size(images):
+    """
+    Model input size for a batch of ROI crops: the largest image side
+    rounded up to the model stride (32), capped at INFERENCE_SIZE, so crops are
+    inferred at their native scale instead of being upscaled. Only pass crops:
+    full frames in the same batch would raise it back to INFERENCE_SIZE.
+    """
+    longest = max(max(image.shape[:2]) for image in images)
+    return min(INFERENCE_SIZE, math.ceil(longest / 32) * 32)
+
 
 class ObjectDetector:
-    def __init__(self, model_path=MODEL_PATH):
-        logger.info(f"Loading YOLO model: {model_path}")
-        try:
-            self.model = YOLO(model_path)
-        except Exception as e:
-            logger.error(f"Failed to load model: {e}")
-            raise e
+    """
+    Per-stream detector: owns the tracker state, identity cache and ROI
+    analysis for one camera. The YOLO model and FaceAuthenticator can be
+    shared between several detectors (see MultiStreamDetector).
+    """
+    def __init__(self, model_path=MODEL_PATH, model=None, face_auth=None):
+        self.model = model if model is not None else load_model(model_path)
             
-        self.classes = [0]  # Class 0 is 'person'
+        self.classes = PERSON_CLASSES
+        
+        # Per-stream tracker (keeps Track IDs consistent for this camera only)
+        self.tracker = create_tracker()
         
         # Initialize Face Authenticator
-        self.face_auth = FaceAuthenticator()
+        self.face_auth = face_auth if face_auth is not None else FaceAuthenticator()
         
         # Optimization: Cache identities for Track IDs
-        self.identity_map = {} # {track_id: {'name': str, 'last_checked': int}}
+        # {track_id: {'name': str, 'last_checked': int, 'last_seen': int, 'pending': bool, 'misses': int,
+        #             'critical': bool}}
+        self.identity_map = {}
         self.frame_count = 0
-        self.face_check_interval = 5 # Faster check (every 5 frames) for better responsiveness
+        self.inference_count = 0 # Schedules the periodic full-frame pass of ROI-cropped inference
+        self.face_check_interval = FACE_CHECK_INTERVAL # Retry Unknown tracks every N frames
+
+        # Last inferred output, redrawn (marked stale) on frames that skip inference
+        self.last_detections = []
+        self.last_status = "SAFE"
+        self.last_annotations = []  # [(face box, label, color)]
 
     def detect_frame(self, frame, roi_points):
         """
         Detects persons using Pose Estimation.
-        Triggers CRITICAL only if Hands (Wrists) or Face (Nose) enter the ROI.
+        Triggers CRITICAL only if Hands (Wrists) or Face (Nose) enter a CRITICAL zone.
+
+        roi_points: normalized ROI points (single zone) or a list of zone dicts (see ROI_ZONES)
         """
         if frame is None:
             return None, [], "SAFE"
 
+        region = self.inference_region(frame, roi_points)
+        if region is None:
+            result = predict_persons(self.model, [frame])[0]
+        else:
+            x1, y1, x2, y2 = region
+            crop = frame[y1:y2, x1:x2]
+            result = self.uncrop(predict_persons(self.model, [crop], crop_input_size([crop]))[0], region, frame)
+        return self.analyze(frame, result, roi_points)
+
+    def inference_region(self, image, roi_points):
+        """
+        Picks the region of `image` to run inference on (ROI-cropped inference).
+
+        Returns:
+            tuple | None: Pixel box (x1, y1, x2, y2) around the zones, or None
+                          for a full-frame pass (cropping disabled, no zones,
+                          zones covering most of the frame, or every
+                          ROI_FULL_FRAME_INTERVAL-th inference)
+        """
+        if not ROI_CROP_ENABLED:
+            return None
+
+        self.inference_count += 1
+        if self.inference_count % ROI_FULL_FRAME_INTERVAL == 0:
+            return None
+
+        bounds = zone_bounds(roi_points, ROI_CROP_MARGIN)
+        if bounds is None:
+            return None
+
+        height, width = image.shape[:2]
+        x1, y1 = int(bounds[0] * width), int(bounds[1] * height)
+        x2, y2 = math.ceil(bounds[2] * width), math.ceil(bounds[3] * height)
+        if (x2 - x1) * (y2 - y1) > ROI_CROP_MAX_AREA * width * height:
+            return None
+        return x1, y1, x2, y2
+
+    def uncrop(self, result, region, image):
+        """
+        Maps a result predicted on a crop of `image` back to image coordinates,
+        rebuilding its Boxes and Keypoints, so tracking and analysis always
+        see full-frame space.
+        """
+        x1, y1 = region[:2]
+        shape = image.shape[:2]
+        result.orig_img = image
+        result.orig_shape = shape
+
+        if result.boxes is not None:
+            boxes = result.boxes.data.clone()
+            boxes[:, [0, 2]] += x1
+            boxes[:, [1, 3]] += y1
+            result.boxes = Boxes(boxes, shape)
+
+        if result.keypoints is not None:
+            kpts = result.keypoints.data.clone()
+            kpts[..., 0] += x1
+            kpts[..., 1] += y1
+            result.keypoints = Keypoints(kpts, shape)
+
+        return result
+
+    def passthrough(self, frame, roi_points):
+        """
+        Annotates a frame that was not inferred (motion gate / scheduler): the
+        zones, plus the boxes of the last inferred frame drawn thin and dimmed
+        as stale, so tracked persons don't flicker between inferred frames.
+
+        Returns the last detections (flagged 'stale') and status.
+        """
+        height, width = frame.shape[:2]
+        self.draw_zones(frame, get_zone_mask(roi_points, width, height))
+        for (fx1, fy1, fx2, fy2), label_text, color in self.last_annotations:
+            stale_color = tuple(c // 2 for c in color)
+            cv2.putText(frame, label_text, (fx1, fy1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, stale_color, 1)
+            cv2.rectangle(frame, (fx1, fy1), (fx2, fy2), stale_color, 1)
+        return frame, [dict(det, stale=True) for det in self.last_detections], self.last_status
+
+    def track(self, result, frame):
+        """
+        Applies this stream's tracker to an untracked prediction result
+        (same steps as ultralytics' model.track(persist=True) callback).
+        """
+        if result.boxes is None or len(result.boxes) == 0:
+            return result
+
+        tracks = self.tracker.update(result.boxes.cpu().numpy(), frame)
+        if len(tracks) == 0:
+            return result
+
+        idx = tracks[:, -1].astype(int)
+        result = result[idx]
+        result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+        return result
+
+    def analyze(self, frame, result, roi_points, detection_frame=None):
+        """
+        Tracks and evaluates one prediction result against the zones,
+        drawing the annotations on the frame.
+        Each person takes the severity of the zones its Hands (Wrists) or
+        Face (Nose) entered; the frame takes the highest person severity.
+
+        detection_frame: downscaled frame the result was predicted on (None if
+        it was predicted on `frame`); coordinates are mapped back to `frame`.
+        """
         self.frame_count += 1
         
-        # Use YOLOv8 Pose Tracking
-        # persist=True keeps Track IDs (consistent colors/IDs)
-        results = self.model.track(frame, classes=self.classes, conf=CONFIDENCE_THRESHOLD, persist=True, verbose=False)
+        # Use YOLOv8 Pose Tracking (Track IDs for consistent colors/IDs)
+        # Tracking runs in detection coordinates
+        result = self.track(result, detection_frame if detection_frame is not None else frame)
         
         height, width = frame.shape[:2]
         detections = []
         overall_status = "SAFE"
         
-        # Prepare ROI polygon
-        roi_pixel_cnt = np.array([
-            (int(x * width), int(y * height)) 
-            for x, y in roi_points
-        ], dtype=np.int32)
-        
-        # Draw ROI
-        cv2.polylines(frame, [roi_pixel_cnt], isClosed=True, color=(255, 0, 0), thickness=2)
-        cv2.putText(frame, "Restricted Area", (roi_pixel_cnt[0][0], roi_pixel_cnt[0][1] - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+        # Compiled zone mask (cached per zone set and frame size)
+        zone_mask = get_zone_mask(roi_points, width, height)
 
-        for result in results:
-            if result.boxes is None:
-                continue
-                
-            # Iterate through detected persons
-            for i, box in enumerate(result.boxes):
-                # --- Basic Info ---
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                track_id = int(box.id[0].cpu().numpy()) if box.id is not None else -1
-                conf = float(box.conf[0].cpu().numpy())
-                
-                # --- Pose / Keypoints ---
-                # Keypoints format: [N, 17, 3] -> (x, y, conf)
-                # We need the keypoints for this specific person (index i)
-                kpts = result.keypoints.data[i].cpu().numpy() # Shape (17, 3)
-                
-                # COCO Keypoint Indices:
-                # 0: Nose
-                # 9: Left Wrist
-                # 10: Right Wrist
-                
-                # Check critical points
-                nose = kpts[0]
-                l_wrist = kpts[9]
-                r_wrist = kpts[10]
-                
-                critical_points = [
-                    ('Nose', nose),
-                    ('L-Wrist', l_wrist),
-                    ('R-Wrist', r_wrist)
-                ]
-                
-                # Logic: Check if ANY critical point is inside ROI
-                is_breach = False
-                breach_points = []
-                
-                for pt_name, pt_data in critical_points:
-                    pixel_x, pixel_y, pt_conf = pt_data
-                    if pt_conf < 0.5: # Skip low confidence points
-                        continue
-                        
-                    pixel_x, pixel_y = int(pixel_x), int(pixel_y)
-                    
-                    # Point Check
-                    if cv2.pointPolygonTest(roi_pixel_cnt, (pixel_x, pixel_y), False) >= 0:
-                        is_breach = True
-                        breach_points.append((pixel_x, pixel_y))
-                
-                
-                # --- FACE RECOGNITION (Detected in Authorization Step) ---
-                name = "Unknown"
-                
-                # --- STATUS DECISION ---
-                status = "SAFE"
-                color = (0, 255, 0) # Green
+        if result.boxes is None or len(result.boxes) == 0:
+            self.evict_identities()
+            self.draw_zones(frame, zone_mask)
+            self.last_detections, self.last_status, self.last_annotations = detections, overall_status, []
+            return frame, detections, overall_status
+
+        # --- Pull the whole result to host once ---
+        # Boxes: [N, 6|7] -> (x1, y1, x2, y2, [track_id,] conf, cls)
+        # Keypoints: [N, 17, 3] -> (x, y, conf)
+        boxes = result.boxes.data.cpu().numpy()
+        kpts = result.keypoints.data.cpu().numpy()
+        if detection_frame is not None:
+            # Map detection-size coordinates back to the full-resolution frame
+            scale = np.array([width / detection_frame.shape[1], height / detection_frame.shape[0]], dtype=np.float32)
+            boxes[:, :4] *= np.tile(scale, 2)
+            kpts[..., :2] *= scale
+        xyxy = boxes[:, :4].astype(np.int64)
+        confs = boxes[:, -2]
+        track_ids = boxes[:, 4].astype(np.int64) if result.boxes.is_track else np.full(len(boxes), -1)
+
+        # --- Vectorized pass over all persons ---
+        # Logic: breach if ANY critical point (Nose, Wrists) is inside a zone (O(1) mask lookup)
+        zone_bits = critical_zone_hits(kpts, zone_mask)
+        severity = zone_mask.severity(zone_bits)
+        # Face bounding box from keypoints (Nose, Eyes, Ears)
+        face_bbox, has_face = face_boxes(kpts, width, height)
+        frontal = frontal_faces(kpts)
+
+        # --- FACE RECOGNITION (cached per Track ID, identified in the background) ---
+        # Runs before any drawing so face crops are clean
+        names = self.update_identities(frame, track_ids, face_bbox, has_face, frontal,
+                                       severity == SEVERITY_LEVELS["CRITICAL"])
+        self.draw_zones(frame, zone_mask)
+
+        annotations = []
+        for i in range(len(boxes)):
+            x1, y1, x2, y2 = (int(v) for v in xyxy[i])
+            name = names[i]
+            
+            # --- STATUS DECISION ---
+            status = "SAFE"
+            color = (0, 255, 0) # Green
+            
+            # --- VISUALIZATION ---
+            if has_face[i]:
+                fx1, fy1, fx2, fy2 = (int(v) for v in face_bbox[i])
                 
-                # --- VISUALIZATION ---
+                # Name Label (Above Face)
+                label_text = f"{name}"
                 
-                # --- VISUALIZATION ---
+                # Known faces are authorized; anyone else breaching a CRITICAL zone is an intruder
+                if severity[i] == SEVERITY_LEVELS["CRITICAL"] and name != "Unknown":
+                     status = "AUTHORIZED"
+                     label_text = f"{name} [AUTHORIZED]"
+                elif severity[i] == SEVERITY_LEVELS["CRITICAL"]:
+                     status = "CRITICAL"
+                     color = (0, 0, 255) # Red
+                     label_text = f"INTRUDER [BREACH]"
+                elif severity[i] == SEVERITY_LEVELS["WARNING"]:
+                     status = "WARNING"
+                     color = (0, 165, 255) # Orange
+                     label_text = f"WARNING [{', '.join(zone_mask.zone_names(zone_bits[i]))}]"
                 
-                # 1. Calculate Face Bounding Box from Keypoints (Nose, Eyes, Ears)
-                face_kpts = kpts[0:5] # First 5 points are face
-                valid_face_pts = face_kpts[face_kpts[:, 2] > 0.5] # Filter low conf
+                if SEVERITY_LEVELS.get(status, 0) > SEVERITY_LEVELS[overall_status]:
+                    overall_status = status
                 
-                face_bbox = None
-                if len(valid_face_pts) >= 2:
-                    # Get bounds of keypoints
-                    bg_x1 = int(np.min(valid_face_pts[:, 0]))
-                    bg_y1 = int(np.min(valid_face_pts[:, 1]))
-                    bg_x2 = int(np.max(valid_face_pts[:, 0]))
-                    bg_y2 = int(np.max(valid_face_pts[:, 1]))
-                    
-                    # Calculate center and dimensions
-                    cx, cy = (bg_x1 + bg_x2) // 2, (bg_y1 + bg_y2) // 2
-                    w = bg_x2 - bg_x1
-                    h = bg_y2 - bg_y1
-                    
-                    # Enforce Square Shape (use max dimension)
-                    sq_size = max(w, h)
-                    
-                    # Add meaningful padding (e.g., 60% extra) to cover whole head
-                    padding = int(sq_size * 0.8) 
-                    size = sq_size + padding
-                    
-                    half_size = size // 2
-                    
-                    fx1 = max(0, cx - half_size)
-                    fy1 = max(0, cy - half_size)
-                    fx2 = min(width, cx + half_size)
-                    fy2 = min(height, cy + half_size)
-                    
-                    # Name Label (Above Face)
-                    label_text = f"{name}"
-                    
-                    # --- FACE RECOGNITION DISABLED ---
-                    # We are forcing status to CRITICAL if breach, ignoring identity for now.
-                    if is_breach:
-                         status = "CRITICAL"
-                         color = (0, 0, 255) # Red
-                         overall_status = "CRITICAL"
-                         label_text = f"INTRUDER [BREACH]"
-                    
-                    cv2.putText(frame, label_text, (fx1, fy1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                    cv2.rectangle(frame, (fx1, fy1), (fx2, fy2), color, 2)
-
-                detections.append({
-                    "bbox": (x1, y1, x2, y2),
-                    "conf": conf,
-                    "status": status,
-                    "name": name
-                })
+                cv2.putText(frame, label_text, (fx1, fy1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                cv2.rectangle(frame, (fx1, fy1), (fx2, fy2), color, 2)
+                annotations.append(((fx1, fy1, fx2, fy2), label_text, color))
+
+            detections.append({
+                "bbox": (x1, y1, x2, y2),
+                "conf": float(confs[i]),
+                "status": status,
+                "name": name,
+                "track_id": int(track_ids[i]),
+                "zones": zone_mask.zone_names(zone_bits[i])
+            })
 
+        self.last_detections, self.last_status, self.last_annotations = detections, overall_status, annotations
         return frame, detections, overall_status
 
+    def update_identities(self, frame, track_ids, face_bbox, has_face, frontal, in_critical):
+        """
+        Returns the cached name for each person and schedules background
+        identification for tracks that are new, still Unknown (every
+        face_check_interval frames) or due for re-verification.
+        """
+        names = []
+        for track_id, bbox, face_visible, is_frontal, critical in zip(track_ids, face_bbox, has_face, frontal,
+                                                                      in_critical):
+            track_id = int(track_id)
+            entry = self.identity_map.get(track_id) if track_id >= 0 else None
+            if entry is not None:
+                entry['last_seen'] = self.frame_count
+                entry['critical'] = bool(critical)
+
+            if (FACE_RECOGNITION_ENABLED and face_visible and track_id >= 0
+                    and self.face_auth.available and self.identity_due(entry)):
+                entry = self.request_identity(track_id, frame, bbox, entry, bool(is_frontal))
+                entry['critical'] = bool(critical)
+
+            names.append(entry['name'] if entry else "Unknown")
+
+        self.evict_identities()
+        return names
+
+    def identity_due(self, entry):
+        """Whether a track needs a (new) identification attempt."""
+        if entry is None:
+            return True
+        if entry['pending']:
+            return False
+        # Unknown tracks and names that failed a re-check are retried quickly
+        if entry['name'] == "Unknown" or entry['misses'] > 0:
+            interval = self.face_check_interval
+        else:
+            interval = IDENTITY_RECHECK_INTERVAL
+        return self.frame_count - entry['last_checked'] >= interval
+
+    def request_identity(self, track_id, frame, bbox, entry, frontal=False):
+        """
+        Submits the face crop of a track for asynchronous identification.
+        Only frontal crops (nose and both eyes confident) skip dlib's face detector.
+        """
+        if entry is None:
+            entry = {'name': "Unknown", 'last_checked': 0, 'last_seen': self.frame_count, 'pending': False, 'misses': 0,
+                     'critical': False}
+            self.identity_map[track_id] = entry
+
+        x1, y1, x2, y2 = (int(v) for v in bbox)
+        face_img = frame[y1:y2, x1:x2].copy() # Frame is annotated afterwards
+        if face_img.size == 0:
+            return entry
+
+        entry['pending'] = True
+        entry['last_checked'] = self.frame_count
+        # Track IDs are only unique per stream, so key requests by detector as well
+        self.face_auth.identify_async((id(self), track_id), face_img, lambda name: self.on_identity(entry, name),
+                                      known_location=frontal)
+        return entry
+
+    def on_identity(self, entry, name):
+        """Applies an identification result (called from the identification service)."""
+        entry['pending'] = False
+        if name is None:
+            return # Dropped by the service: retried after face_check_interval
+
+        if name != "Unknown":
+            entry['name'] = name
+            entry['misses'] = 0
+        elif entry['name'] != "Unknown":
+            # Re-verification failed (face turned away, blur...): decay, don't drop at once,
+            # unless the track is in a CRITICAL zone (the name may come from a track ID switch)
+            entry['misses'] += 1
+            if entry['critical'] or entry['misses'] >= IDENTITY_MAX_MISSES:
+                entry['name'] = "Unknown"
+                entry['misses'] = 0
+
+    def evict_identities(self):
+        """Drops cached identities of tracks that are no longer seen."""
+        expired = [
+            track_id for track_id, entry in self.identity_map.items()
+            if self.frame_count - entry['last_seen'] > IDENTITY_TTL_FRAMES
+        ]
+        for track_id in expired:
+            del self.identity_map[track_id]
+
+    def draw_zones(self, frame, zone_mask):
+        """Draws every zone outline with its name"""
+        for polygon, name, severity in zip(zone_mask.polygons, zone_mask.names, zone_mask.severity_names):
+            color = ZONE_COLORS[severity]
+            cv2.polylines(frame, [polygon], isClosed=True, color=color, thickness=2)
+            cv2.putText(frame, name, (polygon[0][0], polygon[0][1] - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+
     def draw_skeleton(self, frame, kpts, color):
         """Draws simple skeleton lines"""
         # Pairs of indices to connect
@@ -185,3 +413,82 @@ class ObjectDetector:
             if pt1[2] > 0.5 and pt2[2] > 0.5:
                 cv2.line(frame, (int(pt1[0]), int(pt1[1])), (int(pt2[0]), int(pt2[1])), color, 2)
 
+
+class MultiStreamDetector:
+    """
+    Runs one shared YOLO model over several camera streams.
+    Frames from all streams are inferred in a single batched call, then
+    each stream's own ObjectDetector applies its tracker, ROI and identity cache.
+    """
+    def __init__(self, stream_ids, model_path=MODEL_PATH):
+        self.model = load_model(model_path)
+        self.face_auth = FaceAuthenticator()
+        self.streams = {
+            stream_id: ObjectDetector(model=self.model, face_auth=self.face_auth)
+            for stream_id in stream_ids
+        }
+
+    def close(self):
+        """Stops background face identification."""
+        self.face_auth.close()
+
+    def passthrough_frames(self, frames, roi_points):
+        """Same output as detect_frames() for frames that skip inference (zones and last, stale detections)."""
+        return {
+            stream_id: self.streams[stream_id].passthrough(frame, roi_points[stream_id])
+            for stream_id, frame in frames.items()
+        }
+
+    def detect_frames(self, frames, roi_points, detection_frames=None):
+        """
+        Args:
+            frames (dict): {stream_id: frame} (streams without a new frame are omitted)
+            roi_points (dict): {stream_id: ROI points}
+            detection_frames (dict): Optional {stream_id: downscaled frame} to run
+                                     inference on instead of the full frame
+
+        Returns:
+            dict: {stream_id: (processed_frame, detections, overall_status)}
+        """
+        stream_ids = [stream_id for stream_id, frame in frames.items() if frame is not None]
+        if not stream_ids:
+            return {}
+
+        detection_frames = detection_frames or {}
+        images = [
+            detection_frames[stream_id] if detection_frames.get(stream_id) is not None else frames[stream_id]
+            for stream_id in stream_ids
+        ]
+
+        # ROI-cropped inference: streams may be inferred on a crop around their zones
+        regions = [
+            self.streams[stream_id].inference_region(image, roi_points[stream_id])
+            for stream_id, image in zip(stream_ids, images)
+        ]
+        inputs = [
+            image if region is None else image[region[1]:region[3], region[0]:region[2]]
+            for image, region in zip(images, regions)
+        ]
+
+        # Crops and full frames (no ROI, or the periodic full-frame pass) are batched
+        # separately, so a full frame never letterboxes the crops back up to INFERENCE_SIZE
+        results = [None] * len(inputs)
+        cropped = [i for i, region in enumerate(regions) if region is not None]
+        full = [i for i, region in enumerate(regions) if region is None]
+        for batch, imgsz in ((cropped, None), (full, INFERENCE_SIZE)):
+            if not batch:
+                continue
+            batch_inputs = [inputs[i] for i in batch]
+            batch_results = predict_persons(self.model, batch_inputs, imgsz or crop_input_size(batch_inputs))
+            for i, result in zip(batch, batch_results):
+                results[i] = result
+
+        outputs = {}
+        for stream_id, image, region, result in zip(stream_ids, images, regions, results):
+            stream = self.streams[stream_id]
+            if region is not None:
+                result = stream.uncrop(result, region, image)
+            outputs[stream_id] = stream.analyze(
+                frames[stream_id], result, roi_points[stream_id], detection_frames.get(stream_id)
+            )
+        return outputs
@@ -0,0 +1,353 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+import cv2
+import numpy as np
+from src.config import (CLIP_MAX_GAP, CLIP_MAX_SECONDS, CLIP_MIN_SECONDS, CLIP_SEGMENT_SECONDS, EVIDENCE_QUEUE_SIZE,
+                        POSTROLL_SECONDS, PREROLL_JPEG_QUALITY, PREROLL_MAX_BYTES, PREROLL_SECONDS, logger)
+from src.threads import pin_current_thread
+
+
+def encode_jpeg(frame, max_width=0, quality=95):
+    """
+    Encodes a frame to JPEG in memory, downscaled to `max_width` if it is
+    wider (0 = full resolution).
+
+    Returns:
+        np.ndarray: The encoded bytes (cv2.imencode buffer), or None on failure
+    """
+    h, w = frame.shape[:2]
+    if max_width and w > max_width:
+        frame = cv2.resize(frame, (max_width, round(h * max_width / w)), interpolation=cv2.INTER_AREA)
+    ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return data if ok else None
+
+
+class ClipPolicy:
+    """
+    When an evidence clip ends: it lasts at least `min_seconds`, is extended
+    while the breach goes on (until `postroll` seconds after the last
+    CRITICAL frame) and is cut at `max_seconds`. Times are capture timestamps.
+    """
+
+    def __init__(self, min_seconds=CLIP_MIN_SECONDS, max_seconds=CLIP_MAX_SECONDS, postroll=POSTROLL_SECONDS):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.postroll = postroll
+
+    def should_stop(self, start, last_activity, now):
+        length = now - start
+        if length >= self.max_seconds:
+            return True
+        return length >= self.min_seconds and now - last_activity > self.postroll
+
+
+class PrerollBuffer:
+    """
+    Recent frames of one camera, JPEG-compressed, bounded by age
+    (PREROLL_SECONDS) and total size (PREROLL_MAX_BYTES). Flushed into a clip
+    when recording starts so the evidence shows the approach.
+
+    Only used from the EvidenceWriter thread.
+    """
+
+    def __init__(self, seconds=PREROLL_SECONDS, max_bytes=PREROLL_MAX_BYTES, quality=PREROLL_JPEG_QUALITY):
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.frames = deque()  # (timestamp, JPEG bytes)
+        self.bytes = 0
+
+    def add(self, timestamp, frame):
+        ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        self.frames.append((timestamp, data))
+        self.bytes += data.nbytes
+
+        while self.frames and (timestamp - self.frames[0][0] > self.seconds or self.bytes > self.max_bytes):
+            _, old = self.frames.popleft()
+            self.bytes -= old.nbytes
+
+    def drain(self):
+        """Yields the buffered (timestamp, BGR frame) pairs, oldest first, and empties the buffer."""
+        frames, self.frames, self.bytes = self.frames, deque(), 0
+        for timestamp, data in frames:
+            frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield timestamp, frame
+
+
+class TimedClip:
+    """
+    A constant-rate video clip laid out on the capture timeline: each frame
+    is repeated until the next one is due, or dropped if its slot is already
+    filled, so the clip plays back in real time whatever the detection rate.
+
+    The footage is split into `<stem>_000.avi`, `<stem>_001.avi`, ... of
+    `segment_seconds` each, listed with their capture times in `<stem>.json`
+    (rewritten at every new segment and on close).
+
+    Only used from the EvidenceWriter thread.
+    """
+
+    def __init__(self, path, fps, size, fourcc="XVID", segment_seconds=CLIP_SEGMENT_SECONDS, max_gap=CLIP_MAX_GAP,
+                 metadata=None):
+        self.path = Path(path)
+        self.fps = fps
+        self.size = tuple(size)
+        self.fourcc = fourcc
+        self.segment_frames = max(1, int(round(segment_seconds * fps)))
+        self.max_gap = max_gap
+
+        self.writer = None
+        self.segment_slots = 0  # Frames in the current segment
+        self.start = None       # Capture time of slot 0
+        self.slots = 0          # Frames written (including repeats)
+
+        self.index_path = self.path.with_suffix(".json")
+        self.index = {
+            **(metadata or {}),
+            'fps': fps,
+            'size': list(self.size),
+            'started': None,
+            'complete': False,
+            'segments': [],         # {file, start, end, frames}, capture times in epoch seconds
+            'gaps': [],             # [from, to] capture times skipped (camera stalls)
+            'repeated_frames': 0,
+            'dropped_frames': 0
+        }
+
+    def write(self, frame, timestamp=None):
+        """
+        Adds a frame captured at `timestamp` (None = the next slot).
+
+        Returns:
+            int: Frames written to the video (0 if dropped, >1 if repeated)
+        """
+        if self.start is None:
+            self.start = timestamp if timestamp is not None else time.time()
+            self.index['started'] = datetime.fromtimestamp(self.start).isoformat(timespec="milliseconds")
+        next_time = self.start + self.slots / self.fps
+        if timestamp is None:
+            timestamp = next_time
+
+        if timestamp - next_time > self.max_gap:
+            # Camera stall: record the gap and continue on the next slot
+            self.index['gaps'].append([round(next_time, 3), round(timestamp, 3)])
+            self.start = timestamp - self.slots / self.fps
+
+        due = int(round((timestamp - self.start) * self.fps)) + 1  # Slots up to this frame's capture time
+        count = due - self.slots
+        if count <= 0:
+            self.index['dropped_frames'] += 1
+            return 0
+
+        for _ in range(count):
+            self._write_slot(frame)
+        self.index['repeated_frames'] += count - 1
+        return count
+
+    def _write_slot(self, frame):
+        slot_time = self.start + self.slots / self.fps
+        if self.writer is None or self.segment_slots >= self.segment_frames:
+            self._next_segment(slot_time)
+
+        self.writer.write(frame)
+        self.segment_slots += 1
+        self.slots += 1
+
+        segment = self.index['segments'][-1]
+        segment['frames'] += 1
+        segment['end'] = round(slot_time + 1 / self.fps, 3)
+
+    def _next_segment(self, slot_time):
+        if self.writer is not None:
+            self.writer.release()
+
+        number = len(self.index['segments'])
+        path = self.path.with_name(f"{self.path.stem}_{number:03d}{self.path.suffix}")
+        self.writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.size)
+        if not self.writer.isOpened():
+            logger.error(f"Could not open video file {path}")
+        self.segment_slots = 0
+
+        self.index['segments'].append({'file': path.name, 'start': round(slot_time, 3), 'end': round(slot_time, 3),
+                                       'frames': 0})
+        self.save_index()
+
+    def save_index(self):
+        """Writes the JSON index (atomically, so a crash never leaves a truncated one)."""
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+        self.index['complete'] = True
+        self.save_index()
+
+
+class EvidenceWriter:
+    """
+    Evidence I/O off the detection path: alert photos (JPEG) and clip frames
+    (XVID) are encoded and written by a worker thread.
+
+    Frames are taken by reference, so callers must not modify a frame after
+    handing it over. Clip and pre-roll frames are bounded (EVIDENCE_QUEUE_SIZE
+    pending frames, newer frames are dropped when the disk can't keep up);
+    photos and clip open / close requests are never dropped.
+    """
+
+    def __init__(self, max_pending_frames=EVIDENCE_QUEUE_SIZE):
+        self.max_pending_frames = max_pending_frames
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.pending_frames = 0
+
+        self.clips = {}  # {clip_id: TimedClip} (worker thread only)
+        self.next_clip_id = 0
+
+        # Statistics
+        self.stats = {
+            'images_written': 0,
+            'frames_written': 0,
+            'dropped_frames': 0,
+            'errors': 0
+        }
+
+        self.running = True
+        self.thread = threading.Thread(target=self._worker, name="fess-evidence", daemon=True)
+        self.thread.start()
+
+    @property
+    def depth(self):
+        """Requests waiting to be written."""
+        return self.queue.qsize()
+
+    def write_image(self, path, frame, on_saved=None):
+        """Queues a JPEG photo. `on_saved(path)` is called from the writer thread once it is on disk."""
+        self.queue.put(("image", path, frame, on_saved))
+
+    def open_clip(self, path, fps, size, fourcc="XVID", preroll=None, metadata=None):
+        """
+        Queues the creation of a TimedClip (segment files and JSON index named
+        after `path`), starting with the frames of a PrerollBuffer if given.
+        `metadata` is added to the index.
+
+        Returns:
+            int: Clip id for write_frame() / close_clip()
+        """
+        with self.lock:
+            clip_id = self.next_clip_id
+            self.next_clip_id += 1
+        self.queue.put(("open", clip_id, path, fps, size, fourcc, preroll, metadata))
+        return clip_id
+
+    def _reserve_frame(self):
+        with self.lock:
+            if self.pending_frames >= self.max_pending_frames:
+                self.stats['dropped_frames'] += 1
+                return False
+            self.pending_frames += 1
+            return True
+
+    def write_frame(self, clip_id, frame, timestamp=None):
+        """
+        Queues one clip frame, placed on the clip timeline by its capture
+        `timestamp` (None = right after the previous frame).
+
+        Returns:
+            bool: False if the frame was dropped (too many frames pending)
+        """
+        if not self._reserve_frame():
+            return False
+        self.queue.put(("frame", clip_id, frame, timestamp))
+        return True
+
+    def add_preroll(self, preroll, timestamp, frame):
+        """Queues a frame for a PrerollBuffer (compressed on the writer thread). Returns False if dropped."""
+        if not self._reserve_frame():
+            return False
+        self.queue.put(("preroll", preroll, timestamp, frame))
+        return True
+
+    def close_clip(self, clip_id, on_closed=None):
+        """Queues the end of a clip (its pending frames are written first)."""
+        self.queue.put(("close", clip_id, on_closed))
+
+    def close(self, timeout=10.0):
+        """Flushes every pending request and stops the worker."""
+        if not self.running:
+            return
+        self.running = False
+        self.queue.put(None)
+        self.thread.join(timeout=timeout)
+        if self.thread.is_alive():
+            logger.warning(f"Evidence writer did not flush in {timeout:.0f}s ({self.depth} requests left)")
+
+    def _worker(self):
+        pin_current_thread("evidence")
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._handle(item)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Evidence writer error: {e}")
+
+        for clip in self.clips.values():
+            clip.close()
+        self.clips.clear()
+
+    def _handle(self, item):
+        kind = item[0]
+
+        if kind == "frame":
+            _, clip_id, frame, timestamp = item
+            with self.lock:
+                self.pending_frames -= 1
+            clip = self.clips.get(clip_id)
+            if clip is not None:
+                self.stats['frames_written'] += clip.write(frame, timestamp)
+
+        elif kind == "image":
+            _, path, frame, on_saved = item
+            if not cv2.imwrite(str(path), frame):
+                raise IOError(f"Could not write {path}")
+            self.stats['images_written'] += 1
+            if on_saved:
+                on_saved(path)
+
+        elif kind == "preroll":
+            _, preroll, timestamp, frame = item
+            with self.lock:
+                self.pending_frames -= 1
+            preroll.add(timestamp, frame)
+
+        elif kind == "open":
+            _, clip_id, path, fps, size, fourcc, preroll, metadata = item
+            clip = TimedClip(path, fps, size, fourcc, metadata=metadata)
+            self.clips[clip_id] = clip
+            if preroll is not None:
+                for timestamp, frame in preroll.drain():
+                    if (frame.shape[1], frame.shape[0]) == clip.size:
+                        self.stats['frames_written'] += clip.write(frame, timestamp)
+
+        elif kind == "close":
+            _, clip_id, on_closed = item
+            clip = self.clips.pop(clip_id, None)
+            if clip is not None:
+                clip.close()
+            if on_closed:
+                on_closed(clip_id)
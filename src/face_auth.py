@@ -1,24 +1,110 @@
+import hashlib
 import os
 import cv2
 import numpy as np
 from loguru import logger
+from src.config import (
+    FACE_CACHE_PATH, FACE_INDEX_THRESHOLD, FACE_MATCH_TOLERANCE, KNOWN_FACES_DIR
+)
+from src.face_worker import encode_rgb
 
 # Flag to control face recognition availability
 FACE_REC_AVAILABLE = False
 face_recognition = None
 
+# Optional approximate nearest-neighbour index for large rosters
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+ENCODING_SIZE = 128
+
+
+def file_digest(filepath):
+    """SHA-1 of a file's content (detects real changes behind a new mtime)."""
+    sha1 = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def name_from_filename(filename):
+    """'John_2.jpg' -> 'John' (several photos per person via a name suffix)"""
+    return os.path.splitext(filename)[0].split("_")[0]
+
+
+class EncodingIndex:
+    """
+    Known face encodings as one contiguous float32 matrix with vectorized
+    nearest-neighbour search. A person may own several rows (one per photo).
+    Rosters of FACE_INDEX_THRESHOLD encodings or more use an approximate
+    faiss HNSW index when faiss is installed.
+    """
+
+    def __init__(self, encodings, names):
+        self.matrix = np.ascontiguousarray(np.asarray(encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE))
+        self.names = list(names)
+
+        # |m|^2 per row, so distances reduce to one matrix-vector product
+        self.sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+
+        self.ann = None
+        if FAISS_AVAILABLE and len(self.names) >= FACE_INDEX_THRESHOLD:
+            self.ann = faiss.IndexHNSWFlat(ENCODING_SIZE, 32)
+            self.ann.add(self.matrix)
+
+    def __len__(self):
+        return len(self.names)
+
+    def nearest(self, encoding):
+        """
+        Returns:
+            tuple: (row index, euclidean distance) of the closest known encoding,
+                   or (-1, inf) if the index is empty
+        """
+        if not self.names:
+            return -1, float("inf")
+
+        query = np.asarray(encoding, dtype=np.float32)
+
+        if self.ann is not None:
+            sq_dists, rows = self.ann.search(query[None, :], 1)
+            row = int(rows[0, 0])
+            if row < 0:
+                return -1, float("inf")
+            return row, float(np.sqrt(max(sq_dists[0, 0], 0.0)))
+
+        sq_dists = self.sq_norms - 2.0 * (self.matrix @ query) + query @ query
+        row = int(np.argmin(sq_dists))
+        return row, float(np.sqrt(max(sq_dists[row], 0.0)))
+
 
 class FaceAuthenticator:
     """
     Handles face recognition:
-    - Loads known faces from disk
+    - Loads known faces from disk (encodings are cached in FACE_CACHE_PATH,
+      so only new or changed images are encoded)
     - Encodes faces
-    - Identifies detected faces
+    - Identifies detected faces (synchronously, or on the process pool
+      of a FaceIdentificationService)
     """
 
-    def __init__(self):
-        self.known_face_encodings = []
-        self.known_face_names = []
+    def __init__(self, faces_dir=KNOWN_FACES_DIR, cache_path=FACE_CACHE_PATH):
+        self.faces_dir = faces_dir
+        self.cache_path = cache_path
+
+        self.known_faces = EncodingIndex([], [])
+
+        # Per-file cache entries: {filename: {'size', 'mtime_ns', 'digest', 'encoding' (None = no face)}}
+        self.face_entries = {}
+
+        # Background identification service (started on first use)
+        self.service = None
 
         # Try to safely load face_recognition
         self._load_library()
@@ -48,64 +134,199 @@ class FaceAuthenticator:
         """
         Loads face images from 'known_faces/' directory
         and extracts their face encodings.
+        Cached encodings are reused for files whose size and mtime (or,
+        failing that, content hash) are unchanged.
         """
         if not FACE_REC_AVAILABLE:
             return
 
-        faces_dir = "known_faces"
-        os.makedirs(faces_dir, exist_ok=True)
+        os.makedirs(self.faces_dir, exist_ok=True)
 
         logger.info("Loading known faces...")
 
-        for filename in os.listdir(faces_dir):
-            if not filename.lower().endswith((".jpg", ".jpeg", ".png")):
+        cache = self._read_cache()
+        entries = {}
+        encoded = 0
+        changed = False
+
+        for filename in sorted(os.listdir(self.faces_dir)):
+            if not filename.lower().endswith(IMAGE_EXTENSIONS):
                 continue
 
-            filepath = os.path.join(faces_dir, filename)
+            filepath = os.path.join(self.faces_dir, filename)
 
             try:
-                # Read image using OpenCV
-                img = cv2.imread(filepath)
-                if img is None:
-                    logger.warning(f"Could not read image: {filename}")
+                stat = os.stat(filepath)
+                cached = cache.get(filename)
+
+                if cached and (cached['size'], cached['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                    entries[filename] = cached
                     continue
 
-                # Convert image to RGB
-                if img.shape[2] == 4:
-                    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGB)
-                else:
-                    rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+                digest = file_digest(filepath)
+                if cached and cached['digest'] == digest:
+                    # Touched but unchanged (copied, restored from backup...)
+                    cached.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    entries[filename] = cached
+                    changed = True
+                    continue
 
-                # Force uint8 format (fixes unsupported image type errors)
-                rgb_img = np.array(rgb_img, dtype=np.uint8)
+                entries[filename] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'digest': digest,
+                    'encoding': self._encode_file(filepath, filename)
+                }
+                encoded += 1
+                changed = True
 
-                # Extract face encodings
-                encodings = face_recognition.face_encodings(rgb_img)
+            except Exception as e:
+                logger.error(f"Error processing {filename}: {e}")
 
-                if not encodings:
-                    logger.warning(f"No face detected in {filename}")
-                    continue
+        self._set_entries(entries)
+        if changed or entries.keys() != cache.keys():
+            self._write_cache()
 
-                # Save encoding and extracted name
-                self.known_face_encodings.append(encodings[0])
+        logger.info(f"Total known faces loaded: {len(self.known_face_names)} ({encoded} newly encoded)")
 
-                name = os.path.splitext(filename)[0].split("_")[0]
-                self.known_face_names.append(name)
+    def _encode_file(self, filepath, filename):
+        """
+        Encodes the first face of an image file.
 
-                logger.success(f"Loaded face: {name}")
+        Returns:
+            ndarray | None: Face encoding, or None if the image has no usable face
+        """
+        # Read image using OpenCV
+        img = cv2.imread(filepath)
+        if img is None:
+            logger.warning(f"Could not read image: {filename}")
+            return None
+
+        # Convert image to RGB
+        if img.shape[2] == 4:
+            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGRA2RGB)
+        else:
+            rgb_img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
-            except Exception as e:
-                logger.error(f"Error processing {filename}: {e}")
+        # Force uint8 format (fixes unsupported image type errors)
+        rgb_img = np.array(rgb_img, dtype=np.uint8)
+
+        # Extract face encodings
+        encodings = face_recognition.face_encodings(rgb_img)
 
-        logger.info(f"Total known faces loaded: {len(self.known_face_names)}")
+        if not encodings:
+            logger.warning(f"No face detected in {filename}")
+            return None
+
+        logger.success(f"Encoded face: {name_from_filename(filename)}")
+        return encodings[0]
+
+    def _set_entries(self, entries):
+        """Rebuilds the known face lists from the per-file entries."""
+        encodings = []
+        names = []
+        for filename, entry in entries.items():
+            if entry['encoding'] is not None:
+                encodings.append(entry['encoding'])
+                names.append(name_from_filename(filename))
+
+        # Swap in a whole new index so concurrent identifications never see a half-built roster
+        self.face_entries = entries
+        self.known_faces = EncodingIndex(encodings, names)
+
+    def _read_cache(self):
+        """Reads the on-disk encoding cache ({} if missing or unreadable)."""
+        if not os.path.exists(self.cache_path):
+            return {}
+
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                return {
+                    str(filename): {
+                        'size': int(size),
+                        'mtime_ns': int(mtime_ns),
+                        'digest': str(digest),
+                        'encoding': encoding if has_face else None
+                    }
+                    for filename, size, mtime_ns, digest, has_face, encoding in zip(
+                        data['filenames'], data['sizes'], data['mtimes_ns'],
+                        data['digests'], data['has_face'], data['encodings'])
+                }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable face cache {self.cache_path}: {e}")
+            return {}
+
+    def _write_cache(self):
+        """Writes the encoding cache atomically (temp file + rename)."""
+        filenames = list(self.face_entries)
+        entries = [self.face_entries[filename] for filename in filenames]
+
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    filenames=np.array(filenames, dtype=str),
+                    sizes=np.array([e['size'] for e in entries], dtype=np.int64),
+                    mtimes_ns=np.array([e['mtime_ns'] for e in entries], dtype=np.int64),
+                    digests=np.array([e['digest'] for e in entries], dtype=str),
+                    has_face=np.array([e['encoding'] is not None for e in entries], dtype=bool),
+                    encodings=np.array([
+                        e['encoding'] if e['encoding'] is not None else np.zeros(ENCODING_SIZE)
+                        for e in entries
+                    ], dtype=np.float64).reshape(-1, ENCODING_SIZE)
+                )
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Failed to write face cache: {e}")
+
+    def add_face(self, filepath):
+        """
+        Encodes one new (or replaced) image in known_faces/ and appends it to
+        the known faces and the cache, without re-encoding the directory.
+
+        Returns:
+            bool: True if a face was found in the image
+        """
+        if not FACE_REC_AVAILABLE:
+            return False
+
+        filepath = str(filepath)
+        filename = os.path.basename(filepath)
+        stat = os.stat(filepath)
+
+        encoding = self._encode_file(filepath, filename)
+        entries = dict(self.face_entries)
+        entries[filename] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'digest': file_digest(filepath),
+            'encoding': encoding
+        }
+        self._set_entries(entries)
+        self._write_cache()
+        return encoding is not None
+
+    @property
+    def known_face_encodings(self):
+        """Known encodings as a float32 [N, 128] matrix."""
+        return self.known_faces.matrix
+
+    @property
+    def known_face_names(self):
+        return self.known_faces.names
+
+    @property
+    def available(self):
+        """Whether identification can return anything but 'Unknown'."""
+        return FACE_REC_AVAILABLE and len(self.known_faces) > 0
 
     def refresh_faces(self):
         """
-        Reloads known faces from disk.
-        Useful after adding new face images.
+        Rescans known faces on disk.
+        Useful after adding, changing or removing face images; only new or
+        changed images are re-encoded.
         """
-        self.known_face_encodings.clear()
-        self.known_face_names.clear()
         self._load_known_faces()
 
     def identify_face(self, frame, bbox):
@@ -119,14 +340,69 @@ class FaceAuthenticator:
         Returns:
             str: Person name or 'Unknown'
         """
-        if not FACE_REC_AVAILABLE or not self.known_face_encodings:
-            return "Unknown"
-
         x1, y1, x2, y2 = bbox
+        # Arbitrary boxes: let dlib locate the face itself
+        return self.identify_crop(frame[y1:y2, x1:x2], use_known_location=False)
+
+    def identify_async(self, track_key, face_img, callback, known_location=False):
+        """
+        Queues a cropped face (BGR) for background identification.
+
+        Args:
+            track_key (hashable): Identifies the track; newer requests replace queued ones
+            face_img (ndarray): Face crop (owned by the service afterwards)
+            callback (callable): Called with the name, 'Unknown', or None if the
+                                 request was dropped without an answer
+            known_location (bool): The crop is a detector face box of a frontal
+                                   face, so dlib may skip face detection
+        """
+        if self.service is None:
+            from src.face_service import FaceIdentificationService
+            self.service = FaceIdentificationService(self)
+        self.service.submit(track_key, face_img, callback, known_location)
+
+    def match(self, encoding):
+        """
+        Finds the best match for a face encoding among the known faces.
+
+        Returns:
+            tuple: (name or 'Unknown', distance to the closest known encoding)
+        """
+        known_faces = self.known_faces
+        row, distance = known_faces.nearest(encoding)
+        if row < 0 or distance > FACE_MATCH_TOLERANCE:
+            return "Unknown", distance
+        return known_faces.names[row], distance
+
+    def match_encoding(self, encoding):
+        """
+        Matches a face encoding against the known faces.
+
+        Returns:
+            str: Person name or 'Unknown'
+        """
+        return self.match(encoding)[0]
+
+    def close(self):
+        """Stops the background identification service."""
+        if self.service is not None:
+            self.service.shutdown()
+            self.service = None
+
+    def identify_crop(self, face_img, use_known_location=False):
+        """
+        Identifies an already-cropped face image (BGR).
+        With use_known_location the crop must be a detector face box of a
+        frontal face (see face_worker.crop_face_location), so dlib skips face
+        detection.
+
+        Returns:
+            str: Person name or 'Unknown'
+        """
+        if not self.available:
+            return "Unknown"
 
         try:
-            # Crop face from frame
-            face_img = frame[y1:y2, x1:x2]
             if face_img.size == 0:
                 return "Unknown"
 
@@ -135,22 +411,12 @@ class FaceAuthenticator:
             rgb_face = np.array(rgb_face, dtype=np.uint8)
 
             # Encode detected face
-            encodings = face_recognition.face_encodings(rgb_face)
-            if not encodings:
+            encoding = encode_rgb(face_recognition, rgb_face, use_known_location)
+            if encoding is None:
                 return "Unknown"
 
             # Compare against known faces
-            matches = face_recognition.compare_faces(
-                self.known_face_encodings,
-                encodings[0],
-                tolerance=0.5
-            )
-
-            if True in matches:
-                idx = matches.index(True)
-                return self.known_face_names[idx]
-
-            return "Unknown"
+            return self.match_encoding(encoding)
 
         except Exception as e:
             logger.error(f"Face identification error: {e}")
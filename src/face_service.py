@@ -0,0 +1,161 @@
+import functools
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.config import FACE_KNOWN_LOCATION, FACE_QUEUE_SIZE, FACE_WORKER_THREADS, FACE_WORKERS, logger
+from src import face_worker
+from src.threads import pin_current_thread, stage_cpus
+
+
+class FaceIdentificationService:
+    """
+    Face identification on a process pool (sidesteps the GIL for dlib).
+
+    Jobs are (track_key, face crop) pairs. Only the dlib encoding runs in the
+    worker processes; matching against the known faces happens here, so newly
+    enrolled faces apply immediately without touching the workers. Results are
+    delivered through `callback(name)`, where name is None if the request was
+    dropped without an answer.
+
+    Backpressure:
+    - At most one queued request per track (a newer crop replaces the queued one)
+    - Requests for tracks answered after the request was made are dropped as stale
+    - When the queue is full the oldest request is dropped
+    """
+
+    def __init__(self, face_auth, workers=FACE_WORKERS, max_pending=FACE_QUEUE_SIZE):
+        self.face_auth = face_auth
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self.pool = self._create_pool()
+        self.last_restart = 0
+
+        self.pending = OrderedDict()  # {track_key: (request_time, face_img, callback)}
+        self.answered = {}            # {track_key: time of the last answer}
+        self.in_flight = 0
+        self.condition = threading.Condition()
+        self.running = True
+
+        # Statistics
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'dropped_stale': 0,
+            'dropped_overflow': 0
+        }
+
+        self.thread = threading.Thread(target=self._dispatch_loop, name="fess-face-dispatch", daemon=True)
+        self.thread.start()
+        logger.info(f"Face identification service started ({workers} worker process(es)).")
+
+    def _create_pool(self):
+        # spawn: forking a process that already runs torch/OpenCV threads can deadlock.
+        # Spawned workers re-import the entry module, so main.py / src.headless keep
+        # their heavy imports (GUI, model, src.config logging) behind the main guard.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=face_worker.init_worker,
+            initargs=(stage_cpus("encoding"), FACE_WORKER_THREADS)
+        )
+
+    def _restart_pool(self):
+        """Replaces a broken pool (e.g. a worker crashed inside dlib), at most every 5 s."""
+        if time.monotonic() - self.last_restart < 5:
+            return
+        self.last_restart = time.monotonic()
+        logger.warning("Face worker pool broken. Restarting worker processes...")
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = self._create_pool()
+
+    @property
+    def queue_depth(self):
+        return len(self.pending)
+
+    def submit(self, track_key, face_img, callback, known_location=False):
+        """
+        Queues a face crop for identification (non-blocking). `known_location`
+        lets dlib skip face detection (frontal detector face boxes only).
+        """
+        dropped = []
+        with self.condition:
+            if track_key in self.pending:
+                dropped.append(self.pending.pop(track_key)[2])
+                self.stats['dropped_stale'] += 1
+            elif len(self.pending) >= self.max_pending:
+                _, (_, _, oldest_callback, _) = self.pending.popitem(last=False)
+                dropped.append(oldest_callback)
+                self.stats['dropped_overflow'] += 1
+
+            self.pending[track_key] = (time.monotonic(), face_img, callback, known_location)
+            self.stats['submitted'] += 1
+            self.condition.notify()
+
+        for dropped_callback in dropped:
+            dropped_callback(None)
+
+    def _dispatch_loop(self):
+        pin_current_thread("face")
+        while True:
+            with self.condition:
+                while self.running and (not self.pending or self.in_flight >= self.workers):
+                    self.condition.wait()
+                if not self.running:
+                    return
+
+                track_key, (request_time, face_img, callback, known_location) = self.pending.popitem(last=False)
+                stale = self.answered.get(track_key, 0) > request_time
+                if stale:
+                    self.stats['dropped_stale'] += 1
+                else:
+                    self.in_flight += 1
+
+            if stale:
+                callback(None)
+                continue
+
+            try:
+                future = self.pool.submit(face_worker.encode_face, face_img, FACE_KNOWN_LOCATION and known_location)
+            except Exception as e:
+                logger.error(f"Face worker pool unavailable: {e}")
+                if isinstance(e, BrokenProcessPool):
+                    self._restart_pool()
+                with self.condition:
+                    self.in_flight -= 1
+                callback(None)
+                continue
+
+            future.add_done_callback(functools.partial(self._on_encoded, track_key, callback))
+
+    def _on_encoded(self, track_key, callback, future):
+        try:
+            encoding = future.result()
+            name = self.face_auth.match_encoding(encoding) if encoding is not None else "Unknown"
+        except Exception as e:
+            logger.error(f"Face identification error: {e}")
+            name = None
+
+        now = time.monotonic()
+        with self.condition:
+            self.in_flight -= 1
+            self.stats['completed'] += 1
+            if name is not None:
+                self.answered[track_key] = now
+                if len(self.answered) > 1000:
+                    self.answered = {key: t for key, t in self.answered.items() if now - t < 60}
+            self.condition.notify()
+
+        callback(name)
+
+    def shutdown(self):
+        """Stops dispatching and terminates the worker processes."""
+        with self.condition:
+            self.running = False
+            self.pending.clear()
+            self.condition.notify_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Face identification service stopped.")
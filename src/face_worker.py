@@ -0,0 +1,80 @@
+"""
+Face encoding worker for FaceIdentificationService.
+
+Runs inside the service's worker processes so dlib never holds the
+detection process' GIL. Workers are spawned, so they import this module,
+the entry module (main.py / src.headless, both of which keep their heavy
+imports inside main) and nothing else. That is why this module doesn't import
+src.config: workers start fast and don't add their own log sinks.
+"""
+
+import os
+import cv2
+import numpy as np
+
+face_recognition = None
+
+# Detector face crops are square head boxes padded around the face keypoints;
+# the face itself sits in the middle with this margin (fraction of the crop side).
+KNOWN_LOCATION_MARGIN = 0.15
+MIN_KNOWN_LOCATION_SIZE = 40  # Smaller crops fall back to dlib face detection
+
+
+def init_worker(cpus=(), threads=1):
+    """
+    Process pool initializer: applies the encoding stage's thread / CPU
+    settings and loads face_recognition once per worker.
+    """
+    global face_recognition
+    cv2.setNumThreads(threads)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError:
+            pass  # CPUs not available to this process: run unpinned
+
+    import face_recognition as fr
+    face_recognition = fr
+
+
+def crop_face_location(shape):
+    """
+    Face location inside a detector face crop, in face_recognition's
+    (top, right, bottom, left) order, or None if the crop is too small.
+    """
+    height, width = shape[:2]
+    if min(height, width) < MIN_KNOWN_LOCATION_SIZE:
+        return None
+    margin_y = int(height * KNOWN_LOCATION_MARGIN)
+    margin_x = int(width * KNOWN_LOCATION_MARGIN)
+    return (margin_y, width - margin_x, height - margin_y, margin_x)
+
+
+def encode_rgb(fr, rgb_face, use_known_location=False):
+    """
+    Encodes an RGB face crop with the given face_recognition module.
+
+    With use_known_location the pose-derived face location is passed to dlib,
+    skipping its own face detector (the most expensive step). dlib then always
+    returns an encoding, face or not, so callers only set it for crops known
+    to show a frontal face (nose and both eyes confident). Crops too small for
+    a reliable location use detection regardless.
+    """
+    location = crop_face_location(rgb_face.shape) if use_known_location else None
+    if location is not None:
+        return fr.face_encodings(rgb_face, known_face_locations=[location])[0]
+
+    encodings = fr.face_encodings(rgb_face)
+    return encodings[0] if encodings else None
+
+
+def encode_face(face_img, use_known_location=False):
+    """
+    Encodes a cropped face image (BGR) from the detector.
+
+    Returns:
+        ndarray | None: 128-d face encoding, or None if no face was found
+    """
+    rgb_face = cv2.cvtColor(face_img, cv2.COLOR_BGR2RGB)
+    rgb_face = np.array(rgb_face, dtype=np.uint8)
+    return encode_rgb(face_recognition, rgb_face, use_known_location)
@@ -0,0 +1,1004 @@
+"""
+Falcon Eye Security System (FESS) - Professional GUI Dashboard
+Premium customtkinter-based interface for advanced security monitoring
+
+Started with `python main.py`.
+"""
+
+import cv2
+import time
+import queue
+import tkinter as tk
+from datetime import datetime
+from pathlib import Path
+import customtkinter as ctk
+from PIL import Image, ImageTk
+import numpy as np
+
+from src.config import (
+    CAMERA_SOURCES, ALERT_COOLDOWN, DISPLAY_FPS, KNOWN_FACES_DIR, LOGS_DIR, ROI_ZONES, STREAM_ROI_ZONES, logger
+)
+from src.alerts import AlertManager
+from src.camera import ThreadedCamera
+from src.detector import MultiStreamDetector
+from src.evidence import EvidenceWriter
+from src.notifier import TelegramBot
+from src.overlay import StatusOverlay
+from src.pipeline import DetectionPipeline
+from src.threads import configure_threads
+
+
+# Professional Color Palette
+class Colors:
+    # Primary Colors
+    BG_DARK = "#0a0e27"
+    BG_CARD = "#141b2d"
+    BG_CARD_LIGHT = "#1f2940"
+    
+    # Accent Colors
+    ACCENT_BLUE = "#2196F3"
+    ACCENT_CYAN = "#00E5FF"
+    ACCENT_GREEN = "#00E676"
+    ACCENT_RED = "#FF1744"
+    ACCENT_ORANGE = "#FF9800"
+    ACCENT_PURPLE = "#9C27B0"
+    
+    # Status Colors
+    SUCCESS = "#00E676"
+    WARNING = "#FFC107"
+    CRITICAL = "#FF1744"
+    INFO = "#64B5F6"
+    
+    # Text Colors
+    TEXT_PRIMARY = "#FFFFFF"
+    TEXT_SECONDARY = "#B0BEC5"
+    TEXT_MUTED = "#78909C"
+
+
+class StatusBadge(ctk.CTkFrame):
+    """Custom status badge widget with icon and text"""
+    def __init__(self, master, icon, label, status_text="", **kwargs):
+        super().__init__(master, fg_color=Colors.BG_CARD_LIGHT, corner_radius=12, **kwargs)
+        
+        self.grid_columnconfigure(1, weight=1)
+        
+        # Icon
+        self.icon_label = ctk.CTkLabel(
+            self,
+            text=icon,
+            font=ctk.CTkFont(size=28),
+            width=50
+        )
+        self.icon_label.grid(row=0, column=0, rowspan=2, padx=(15, 10), pady=15)
+        
+        # Label
+        self.label = ctk.CTkLabel(
+            self,
+            text=label,
+            font=ctk.CTkFont(size=11),
+            text_color=Colors.TEXT_MUTED,
+            anchor="w"
+        )
+        self.label.grid(row=0, column=1, sticky="w", padx=(0, 15), pady=(15, 0))
+        
+        # Status Text
+        self.status_label = ctk.CTkLabel(
+            self,
+            text=status_text,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=Colors.TEXT_PRIMARY,
+            anchor="w"
+        )
+        self.status_label.grid(row=1, column=1, sticky="w", padx=(0, 15), pady=(0, 15))
+    
+    def update_status(self, text, color=Colors.TEXT_PRIMARY):
+        """Update status text and color"""
+        self.status_label.configure(text=text, text_color=color)
+
+
+class StatCard(ctk.CTkFrame):
+    """Statistics card widget"""
+    def __init__(self, master, label, value="0", icon="", color=Colors.ACCENT_BLUE, **kwargs):
+        super().__init__(master, fg_color=Colors.BG_CARD_LIGHT, corner_radius=10, **kwargs)
+        
+        # Icon and Value
+        header_frame = ctk.CTkFrame(self, fg_color="transparent")
+        header_frame.pack(fill="x", padx=15, pady=(12, 5))
+        
+        ctk.CTkLabel(
+            header_frame,
+            text=icon,
+            font=ctk.CTkFont(size=20),
+            text_color=color
+        ).pack(side="left")
+        
+        self.value_label = ctk.CTkLabel(
+            header_frame,
+            text=value,
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=Colors.TEXT_PRIMARY
+        )
+        self.value_label.pack(side="right")
+        
+        # Label
+        ctk.CTkLabel(
+            self,
+            text=label,
+            font=ctk.CTkFont(size=11),
+            text_color=Colors.TEXT_MUTED,
+            anchor="w"
+        ).pack(anchor="w", padx=15, pady=(0, 12))
+    
+    def update_value(self, value):
+        """Update the displayed value"""
+        self.value_label.configure(text=str(value))
+
+
+import winsound
+import glob
+
+class FESSApp(ctk.CTk):
+    """
+    Professional GUI Application for Falcon Eye Security System
+    """
+    def __init__(self):
+        super().__init__()
+        
+        # Window Configuration
+        self.title("🦅 Falcon Eye Security System - Professional Dashboard")
+        
+        # Laptop-friendly size (fits 1366x768 screens)
+        window_width = 1100
+        window_height = 650
+        
+        # Get screen dimensions
+        screen_width = self.winfo_screenwidth()
+        screen_height = self.winfo_screenheight()
+        
+        # Calculate center position
+        center_x = int((screen_width - window_width) / 2)
+        center_y = int((screen_height - window_height) / 2)
+        
+        # Set geometry with centered position
+        self.geometry(f"{window_width}x{window_height}+{center_x}+{center_y}")
+        # Start maximized
+        # self.after(0, lambda: self.state('zoomed'))
+        self.bind("<Escape>", lambda e: self.attributes("-fullscreen", False))
+
+        
+        # Set Dark Theme with custom colors
+        ctk.set_appearance_mode("dark")
+        ctk.set_default_color_theme("blue")
+        
+        # Configure window background
+        self.configure(fg_color=Colors.BG_DARK)
+        
+        # System State - AUTO-ARMED on startup
+        self.armed = True
+        self.running = True
+        
+        # New Features State
+        self.sound_enabled = True
+        self.confidence_threshold = 0.6
+        self.alert_cooldown = ALERT_COOLDOWN
+        
+        # Camera Streams (cam0, cam1, ... in CAMERA_SOURCES order)
+        self.stream_ids = [f"cam{i}" for i in range(len(CAMERA_SOURCES))]
+        self.selected_stream = self.stream_ids[0]
+        self.latest_results = {}
+        
+        # Display State (one reused PhotoImage, refreshed at most DISPLAY_FPS times per second)
+        self.video_photo = None
+        self.last_display = 0.0
+        self.status_overlay = StatusOverlay()
+        
+        # UI updates posted from pipeline threads (Tk is not thread-safe)
+        self.ui_events = queue.Queue()
+        self.shown_stats = {}
+        
+        # Initialize Components
+        logger.info("Initializing Professional GUI Dashboard...")
+        
+        try:
+            configure_threads()
+            print("DEBUG: Initializing initialization of Object Detector...")
+            self.detector = MultiStreamDetector(self.stream_ids)
+            print("DEBUG: Object Detector initialized successfully.")
+        except Exception as e:
+            logger.critical(f"Failed to initialize Detector: {e}")
+            print(f"DEBUG: Detector failed: {e}")
+            self.show_error_and_exit("Detector initialization failed")
+            return
+        
+        self.bot = TelegramBot()
+        self.bot.start()
+        
+        # Auto-arm the bot as well
+        self.bot.is_armed = True
+        
+        # Decision / Alerting Stage (one per stream, sharing one evidence writer)
+        self.evidence = EvidenceWriter()
+        multi_camera = len(self.stream_ids) > 1
+        self.alerts = {
+            stream_id: AlertManager(
+                self.bot,
+                on_log=self.post_log,
+                on_alert=self.post_alert,
+                alert_cooldown=self.alert_cooldown,
+                camera_name=stream_id if multi_camera else None,
+                evidence=self.evidence
+            )
+            for stream_id in self.stream_ids
+        }
+        
+        # Cameras
+        self.cameras = {}
+        for stream_id, source in zip(self.stream_ids, CAMERA_SOURCES):
+            logger.info(f"Connecting to camera {stream_id}: {source}")
+            self.cameras[stream_id] = ThreadedCamera(source)
+        time.sleep(1.5)
+        
+        # Detection Pipeline (capture -> inference -> decision -> render)
+        self.pipeline = DetectionPipeline(
+            self.cameras,
+            self.detector,
+            {stream_id: STREAM_ROI_ZONES.get(stream_id, ROI_ZONES) for stream_id in self.stream_ids},
+            decision_handler=lambda result: self.alerts[result["stream_id"]].process(result)
+        )
+        
+        # Build UI
+        self.build_ui()
+        
+        # Start Video Loop - REMOVED from here, moved to start_system()
+        # self.update_frame()
+        
+        # Handle Window Close
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        logger.info("✅ Professional FESS Dashboard Ready")
+    
+    def start_system(self):
+        """Starts the detection pipeline and the render loop after login"""
+        self.pipeline.start()
+        self.update_frame()
+
+    def show_error_and_exit(self, message):
+        """Show error dialog and exit"""
+        import tkinter.messagebox as mb
+        mb.showerror("Fatal Error", message)
+        self.quit()
+
+    
+    def build_ui(self):
+        """Construct the Professional GUI Layout"""
+        # Configure grid weights
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=7)  # Video section
+        self.grid_columnconfigure(1, weight=3)  # Control panel
+        
+        # ========== HEADER BAR ==========
+        header = ctk.CTkFrame(self, fg_color=Colors.BG_CARD, height=70, corner_radius=0)
+        header.grid(row=0, column=0, columnspan=2, sticky="ew", padx=0, pady=0)
+        header.grid_propagate(False)
+        
+        # Logo and Title
+        title_frame = ctk.CTkFrame(header, fg_color="transparent")
+        title_frame.pack(side="left", padx=25, pady=15)
+        
+        ctk.CTkLabel(
+            title_frame,
+            text="🦅",
+            font=ctk.CTkFont(size=32)
+        ).pack(side="left", padx=(0, 15))
+        
+        ctk.CTkLabel(
+            title_frame,
+            text="FALCON EYE",
+            font=ctk.CTkFont(size=24, weight="bold"),
+            text_color=Colors.ACCENT_CYAN
+        ).pack(side="left")
+        
+        ctk.CTkLabel(
+            title_frame,
+            text="Security System",
+            font=ctk.CTkFont(size=14),
+            text_color=Colors.TEXT_MUTED
+        ).pack(side="left", padx=(10, 0))
+        
+        # System Time
+        self.time_label = ctk.CTkLabel(
+            header,
+            text=datetime.now().strftime("%H:%M:%S"),
+            font=ctk.CTkFont(size=18, family="Consolas"),
+            text_color=Colors.TEXT_SECONDARY
+        )
+        self.time_label.pack(side="right", padx=25)
+        
+        # ========== LEFT PANEL: VIDEO FEED ==========
+        video_container = ctk.CTkFrame(self, fg_color="transparent")
+        # Reduced padding to maximize video size
+        video_container.grid(row=1, column=0, padx=(5, 5), pady=(5, 5), sticky="nsew")
+        video_container.grid_rowconfigure(1, weight=1)
+        video_container.grid_columnconfigure(0, weight=1)
+        
+        # Video Header
+        video_header = ctk.CTkFrame(video_container, fg_color=Colors.BG_CARD, height=50, corner_radius=10)
+        video_header.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        video_header.grid_propagate(False)
+        
+        ctk.CTkLabel(
+            video_header,
+            text="📹 LIVE FEED",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=Colors.TEXT_PRIMARY
+        ).pack(side="left", padx=20, pady=10)
+        
+        # Recording indicator
+        self.recording_indicator = ctk.CTkLabel(
+            video_header,
+            text="● REC",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            text_color=Colors.CRITICAL
+        )
+        self.recording_indicator.pack(side="right", padx=20)
+        
+        # Camera selector (multi-camera mode)
+        if len(self.stream_ids) > 1:
+            self.stream_selector = ctk.CTkSegmentedButton(
+                video_header,
+                values=self.stream_ids,
+                command=self.select_stream
+            )
+            self.stream_selector.set(self.selected_stream)
+            self.stream_selector.pack(side="right", padx=10)
+        
+        # Video Display
+        self.video_frame = ctk.CTkFrame(video_container, fg_color=Colors.BG_CARD, corner_radius=10)
+        self.video_frame.grid(row=1, column=0, sticky="nsew")
+        
+        # Plain Tk label: its PhotoImage is updated in place with paste() every frame
+        self.video_label = tk.Label(self.video_frame, bg=Colors.BG_CARD, bd=0, highlightthickness=0)
+        self.video_label.pack(expand=True, fill="both", padx=0, pady=0)
+        
+        # ========== RIGHT PANEL: CONTROL CENTER (TABVIEW) ==========
+        self.tab_view = ctk.CTkTabview(self, fg_color="transparent")
+        self.tab_view.grid(row=1, column=1, padx=(8, 15), pady=(0, 15), sticky="nsew")
+        
+        # Create Tabs
+        self.tab_controls = self.tab_view.add("Controls")
+        self.tab_gallery = self.tab_view.add("Gallery")
+        self.tab_settings = self.tab_view.add("Settings")
+        
+        # === TAB 1: CONTROLS ===
+        self.build_controls_tab(self.tab_controls)
+        
+        # === TAB 2: GALLERY ===
+        self.build_gallery_tab(self.tab_gallery)
+        
+        # === TAB 3: SETTINGS ===
+        self.build_settings_tab(self.tab_settings)
+
+    def build_controls_tab(self, parent):
+        """Build the main control panel"""
+        parent.grid_columnconfigure(0, weight=1)
+        
+        # === SYSTEM STATUS SECTION ===
+        self.create_section_header(parent, "⚡ SYSTEM STATUS")
+        
+        status_grid = ctk.CTkFrame(parent, fg_color="transparent")
+        status_grid.pack(fill="x", pady=(0, 20))
+        status_grid.grid_columnconfigure((0, 1), weight=1)
+        
+        # Armed Status Badge
+        self.armed_badge = StatusBadge(
+            status_grid,
+            icon="🛡️",
+            label="System Mode",
+            status_text="ARMED",
+            height=90
+        )
+        self.armed_badge.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        self.armed_badge.update_status("ARMED", Colors.CRITICAL)
+        
+        # Telegram Status Badge
+        self.telegram_badge = StatusBadge(
+            status_grid,
+            icon="📡",
+            label="Telegram Bot",
+            status_text="OFFLINE",
+            height=90
+        )
+        self.telegram_badge.grid(row=1, column=0, columnspan=2, sticky="ew")
+        
+        # Update Telegram status
+        telegram_connected = self.bot.loop and self.bot.loop.is_running()
+        self.telegram_badge.update_status(
+            "ONLINE" if telegram_connected else "OFFLINE",
+            Colors.SUCCESS if telegram_connected else Colors.CRITICAL
+        )
+        
+        # === STATISTICS SECTION ===
+        self.create_section_header(parent, "📊 STATISTICS")
+        
+        stats_container = ctk.CTkFrame(parent, fg_color="transparent")
+        stats_container.pack(fill="x", pady=(0, 20))
+        stats_container.grid_columnconfigure((0, 1), weight=1)
+        
+        # Stat Cards
+        self.stat_detections = StatCard(
+            stats_container,
+            label="Total Detections",
+            value="0",
+            icon="👁️",
+            color=Colors.ACCENT_BLUE
+        )
+        self.stat_detections.grid(row=0, column=0, sticky="ew", padx=(0, 5), pady=(0, 8))
+        
+        self.stat_authorized = StatCard(
+            stats_container,
+            label="Authorized",
+            value="0",
+            icon="✅",
+            color=Colors.SUCCESS
+        )
+        self.stat_authorized.grid(row=0, column=1, sticky="ew", padx=(5, 0), pady=(0, 8))
+        
+        self.stat_intruders = StatCard(
+            stats_container,
+            label="Intruders",
+            value="0",
+            icon="⚠️",
+            color=Colors.CRITICAL
+        )
+        self.stat_intruders.grid(row=1, column=0, sticky="ew", padx=(0, 5), pady=0)
+        
+        self.stat_alerts = StatCard(
+            stats_container,
+            label="Alerts Sent",
+            value="0",
+            icon="📤",
+            color=Colors.ACCENT_PURPLE
+        )
+        self.stat_alerts.grid(row=1, column=1, sticky="ew", padx=(5, 0), pady=0)
+        
+        # === CONTROL SECTION ===
+        self.create_section_header(parent, "🎮 CONTROLS")
+        
+        controls_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        controls_frame.pack(fill="x", pady=(0, 20))
+        
+        # ARM Button
+        self.arm_button = ctk.CTkButton(
+            controls_frame,
+            text="🔴  ARM SYSTEM",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            height=55,
+            fg_color=Colors.ACCENT_RED,
+            hover_color="#D50000",
+            border_width=0,
+            corner_radius=12,
+            command=self.arm_system
+        )
+        self.arm_button.pack(fill="x", pady=(0, 12))
+        
+        # DISARM Button
+        self.disarm_button = ctk.CTkButton(
+            controls_frame,
+            text="🟢  DISARM",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            height=55,
+            fg_color=Colors.BG_CARD_LIGHT,
+            hover_color=Colors.BG_CARD,
+            border_width=2,
+            border_color=Colors.SUCCESS,
+            text_color=Colors.SUCCESS,
+            corner_radius=12,
+            command=self.disarm_system
+        )
+        self.disarm_button.pack(fill="x", pady=(0, 12))
+        
+        # EXIT Button
+        self.exit_button = ctk.CTkButton(
+            controls_frame,
+            text="🚪  EXIT APP",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            height=40,
+            fg_color=Colors.BG_CARD,
+            hover_color="#37474F",
+            text_color=Colors.TEXT_SECONDARY,
+            corner_radius=12,
+            command=self.on_closing
+        )
+        self.exit_button.pack(fill="x")
+        
+        # === ACTIVITY LOG SECTION ===
+        self.create_section_header(parent, "📋 ACTIVITY LOG")
+        
+        log_frame = ctk.CTkFrame(parent, fg_color=Colors.BG_CARD, corner_radius=10)
+        log_frame.pack(fill="both", expand=True)
+        
+        # Log Box
+        self.log_box = ctk.CTkTextbox(
+            log_frame,
+            font=ctk.CTkFont(size=11, family="Consolas"),
+            wrap="word",
+            fg_color=Colors.BG_CARD_LIGHT,
+            border_width=0,
+            corner_radius=8
+        )
+        self.log_box.pack(fill="both", expand=True, padx=8, pady=8)
+        
+        # Initial Logs
+        self.add_log("System initialized successfully", "info")
+        self.add_log("Camera connected and streaming", "success")
+        self.add_log("Face recognition module loaded", "success")
+        if self.bot.loop and self.bot.loop.is_running():
+            self.add_log("Telegram bot connected", "success")
+        else:
+            self.add_log("Telegram bot offline", "warning")
+        
+        # Auto-armed notification
+        self.add_log("🚀 System Auto-Started & Armed - Active monitoring enabled", "warning")
+
+    def build_gallery_tab(self, parent):
+        """Build the Gallery Tab"""
+        parent.grid_columnconfigure(0, weight=1)
+        parent.grid_rowconfigure(0, weight=1)
+        
+        self.gallery_frame = ctk.CTkScrollableFrame(parent, fg_color="transparent")
+        self.gallery_frame.grid(row=0, column=0, sticky="nsew")
+        
+        self.refresh_gallery_button = ctk.CTkButton(
+            parent,
+            text="🔄 Refresh Gallery",
+            command=self.load_gallery_images
+        )
+        self.refresh_gallery_button.grid(row=1, column=0, pady=10)
+        
+        self.load_gallery_images()
+
+    def load_gallery_images(self):
+        """Load images from logs directory into gallery"""
+        # Clear existing
+        for widget in self.gallery_frame.winfo_children():
+            widget.destroy()
+            
+        # Find images
+        images = sorted(glob.glob(str(LOGS_DIR / "*.jpg")), reverse=True)[:20] # Show last 20
+        
+        if not images:
+            ctk.CTkLabel(self.gallery_frame, text="No alerts yet.").pack(pady=20)
+            return
+
+        for img_path in images:
+            try:
+                # Load and resize thumbnail
+                pil_img = Image.open(img_path)
+                pil_img.thumbnail((250, 200))
+                ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
+                
+                # Create card
+                card = ctk.CTkFrame(self.gallery_frame, fg_color=Colors.BG_CARD_LIGHT)
+                card.pack(pady=5, padx=5, fill="x")
+                
+                label = ctk.CTkLabel(card, image=ctk_img, text="")
+                label.pack(pady=5)
+                
+                name = Path(img_path).name
+                ctk.CTkLabel(card, text=name, font=ctk.CTkFont(size=10)).pack(pady=(0,5))
+            except Exception as e:
+                logger.error(f"Failed to load gallery image {img_path}: {e}")
+
+    def build_settings_tab(self, parent):
+        """Build the Settings Tab"""
+        parent.grid_columnconfigure(0, weight=1)
+        
+        self.create_section_header(parent, "🔊 AUDIO ALARM")
+        
+        self.sound_switch = ctk.CTkSwitch(
+            parent,
+            text="Enable Siren Sound",
+            command=self.toggle_sound,
+            onvalue=True,
+            offvalue=False
+        )
+        self.sound_switch.select()
+        self.sound_switch.pack(pady=10, anchor="w", padx=20)
+        
+        self.create_section_header(parent, "⚙️ SENSITIVITY")
+        
+        ctk.CTkLabel(parent, text="Confidence Threshold").pack(anchor="w", padx=20)
+        self.conf_slider = ctk.CTkSlider(
+            parent,
+            from_=0.1,
+            to=1.0,
+            number_of_steps=9,
+            command=self.update_conf
+        )
+        self.conf_slider.set(self.confidence_threshold)
+        self.conf_slider.pack(fill="x", padx=20, pady=(0, 20))
+        
+        ctk.CTkLabel(parent, text="Alert Cooldown (Seconds)").pack(anchor="w", padx=20)
+        self.cooldown_slider = ctk.CTkSlider(
+            parent,
+            from_=5,
+            to=60,
+            number_of_steps=11,
+            command=self.update_cooldown
+        )
+        self.cooldown_slider.set(self.alert_cooldown)
+        self.cooldown_slider.set(self.alert_cooldown)
+        self.cooldown_slider.pack(fill="x", padx=20, pady=(0, 20))
+
+        # --- NEW: Add Face Section ---
+        self.create_section_header(parent, "👤 ADD AUTHORIZED PERSON")
+        
+        input_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        input_frame.pack(fill="x", padx=20, pady=5)
+        
+        self.new_person_name = ctk.CTkEntry(input_frame, placeholder_text="Enter Name (e.g. John)")
+        self.new_person_name.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        
+        ctk.CTkButton(
+            input_frame, 
+            text="📷 Capture & Add", 
+            width=100,
+            command=self.capture_new_face
+        ).pack(side="right")
+        
+        ctk.CTkLabel(parent, text="* Stand in front of camera and look straight", font=ctk.CTkFont(size=10), text_color=Colors.TEXT_MUTED).pack(anchor="w", padx=25)
+
+    def capture_new_face(self):
+        """Captures the current frame and adds it to known faces"""
+        name = self.new_person_name.get().strip()
+        if not name:
+            self.add_log("Please enter a name first.", "warning")
+            return
+            
+        frame = self.pipeline.snapshot(self.selected_stream)
+        if frame is None:
+            self.add_log("Camera error - cannot capture.", "critical")
+            return
+            
+        # Detect Face (Reuse detector logic or just save full frame and let face_auth handle crop)
+        # Using full frame is safer as face_auth handles finding the face.
+        
+        try:
+            filename = f"{name}.jpg"
+            filepath = KNOWN_FACES_DIR / filename
+            
+            # Save Image
+            cv2.imwrite(str(filepath), frame)
+            
+            self.add_log(f"Saved photo for {name}.", "success")
+            
+            # Add to Authenticator (incremental, no full re-encode)
+            if self.detector.face_auth.add_face(filepath):
+                self.add_log(f"Database updated. {name} is now Authorized.", "success")
+            else:
+                self.add_log(f"No face found in photo of {name}. Please try again.", "warning")
+            
+            # Clear input
+            self.new_person_name.delete(0, 'end')
+            
+        except Exception as e:
+            logger.error(f"Failed to add face: {e}")
+            self.add_log(f"Error adding face: {e}", "critical")
+
+    def toggle_sound(self):
+        self.sound_enabled = self.sound_switch.get()
+        self.add_log(f"Sound Alarm {'Enabled' if self.sound_enabled else 'Disabled'}", "info")
+
+    def update_conf(self, value):
+        self.confidence_threshold = value
+        # Update config constant if possible, or just use instance var
+        # Note: detector uses config constant, so we might need to pass it
+        self.add_log(f"Confidence Threshold set to {value:.1f}", "info")
+
+    def update_cooldown(self, value):
+        self.alert_cooldown = int(value)
+        for alerts in self.alerts.values():
+            alerts.alert_cooldown = self.alert_cooldown
+        self.add_log(f"Alert Cooldown set to {int(value)}s", "info")
+
+    def create_section_header(self, parent, text):
+        """Create a styled section header"""
+        header_frame = ctk.CTkFrame(parent, fg_color="transparent", height=40)
+        header_frame.pack(fill="x", pady=(10, 15))
+        header_frame.pack_propagate(False)
+        
+        ctk.CTkLabel(
+            header_frame,
+            text=text,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color=Colors.TEXT_SECONDARY,
+            anchor="w"
+        ).pack(side="left", fill="x")
+        
+        # Separator line
+        separator = ctk.CTkFrame(header_frame, fg_color=Colors.BG_CARD_LIGHT, height=2)
+        separator.pack(side="bottom", fill="x", pady=(8, 0))
+    
+    def add_log(self, message, level="info"):
+        """Add an entry to the activity log with enhanced formatting"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        
+        color_map = {
+            "info": Colors.INFO,
+            "success": Colors.SUCCESS,
+            "warning": Colors.WARNING,
+            "critical": Colors.CRITICAL
+        }
+        
+        icon_map = {
+            "info": "ℹ️",
+            "success": "✓",
+            "warning": "⚠",
+            "critical": "✖"
+        }
+        
+        color = color_map.get(level, Colors.TEXT_SECONDARY)
+        icon = icon_map.get(level, "•")
+        
+        self.log_box.configure(state="normal")
+        
+        # Timestamp
+        self.log_box.insert("end", f"[{timestamp}] ", "timestamp")
+        
+        # Icon
+        self.log_box.insert("end", f"{icon} ", level + "_icon")
+        
+        # Message
+        self.log_box.insert("end", f"{message}\n", level)
+        
+        # Apply tags
+        self.log_box.tag_config("timestamp", foreground=Colors.TEXT_MUTED)
+        self.log_box.tag_config(level + "_icon", foreground=color)
+        self.log_box.tag_config(level, foreground=color)
+        
+        self.log_box.see("end")
+        self.log_box.configure(state="disabled")
+    
+    def post_log(self, message, level="info"):
+        """Thread-safe add_log: queued and applied by the render loop"""
+        self.ui_events.put((self.add_log, (message, level)))
+    
+    def post_alert(self, filepath):
+        """Thread-safe alert notification: refreshes the gallery on the Tk thread"""
+        self.ui_events.put((self.load_gallery_images, ()))
+    
+    def process_ui_events(self):
+        """Apply UI updates posted by the pipeline threads"""
+        while True:
+            try:
+                callback, args = self.ui_events.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+    
+    def arm_system(self):
+        """ARM the security system"""
+        self.armed = True
+        for alerts in self.alerts.values():
+            alerts.armed = True
+        self.bot.is_armed = True
+        self.armed_badge.update_status("ARMED", Colors.CRITICAL)
+        self.add_log("System ARMED - Active threat monitoring enabled", "warning")
+        logger.info("System Armed via GUI")
+    
+    def disarm_system(self):
+        """DISARM the security system"""
+        self.armed = False
+        for alerts in self.alerts.values():
+            alerts.armed = False
+        self.bot.is_armed = False
+        self.armed_badge.update_status("STANDBY", Colors.TEXT_MUTED)
+        self.add_log("System DISARMED - Passive surveillance mode", "info")
+        logger.info("System Disarmed via GUI")
+    
+    def update_frame(self):
+        """Render loop: displays already-annotated results from the pipeline"""
+        if not self.running:
+            return
+            
+        try:
+            # Update time
+            self.time_label.configure(text=datetime.now().strftime("%H:%M:%S"))
+            
+            # Apply logs / gallery refreshes posted by the decision stage
+            self.process_ui_events()
+            
+            # Collect new results from every stream
+            new_result = False
+            while True:
+                result = self.pipeline.get_result()
+                if result is None:
+                    break
+                new_result = True
+                self.latest_results[result["stream_id"]] = result
+                
+                # Sound Alarm (any camera; skipped frames only repeat the last inferred status)
+                if result["status"] == "CRITICAL" and not result.get("skipped"):
+                    self.sound_alarm()
+            
+            if new_result:
+                # Statistics
+                self.update_stats()
+            
+            # Render the newest frame of the selected camera (rate-capped, skipped while hidden)
+            if self.selected_stream in self.latest_results and self.display_due():
+                processed_frame = self.latest_results.pop(self.selected_stream)["frame"]
+                
+                # The pipeline frame may still be queued for evidence writing: draw on the scaled copy
+                display = self.scale_frame(processed_frame)
+                
+                # Enhanced status overlay
+                self.draw_enhanced_overlay(display)
+                
+                # Display frame
+                self.display_frame(display)
+                
+        except Exception as e:
+            logger.error(f"Error in update_frame loop: {e}")
+            # Don't crash, just log and continue
+        
+        # Schedule next update
+        if self.running:
+            self.after(10, self.update_frame)
+    
+    def sound_alarm(self):
+        """Play the siren while armed (non-blocking)"""
+        if self.armed and self.sound_enabled:
+            try:
+                winsound.PlaySound("siren.wav", winsound.SND_FILENAME | winsound.SND_ASYNC)
+            except Exception:
+                pass
+    
+    def select_stream(self, stream_id):
+        """Switch the live feed to another camera"""
+        self.selected_stream = stream_id
+        self.add_log(f"Live feed switched to {stream_id}", "info")
+    
+    def update_stats(self):
+        """Refresh stat cards that changed since the last render"""
+        cards = {
+            'total_detections': self.stat_detections,
+            'authorized_count': self.stat_authorized,
+            'intruder_count': self.stat_intruders,
+            'alerts_sent': self.stat_alerts
+        }
+        for key, card in cards.items():
+            value = sum(alerts.stats[key] for alerts in self.alerts.values())
+            if self.shown_stats.get(key) != value:
+                card.update_value(value)
+                self.shown_stats[key] = value
+    
+    def draw_enhanced_overlay(self, frame):
+        """Draw professional status overlay on video"""
+        self.status_overlay.draw(frame, self.armed, self.alerts[self.selected_stream].is_recording)
+    
+    def display_due(self):
+        """Whether a new frame should be rendered now (DISPLAY_FPS cap, window visible)"""
+        now = time.monotonic()
+        if now - self.last_display < 1.0 / DISPLAY_FPS:
+            return False
+        # Nothing to see while minimized / hidden: skip the overlay, resize and Tk update
+        if self.state() in ("iconic", "withdrawn") or not self.video_frame.winfo_viewable():
+            return False
+        self.last_display = now
+        return True
+    
+    def scale_frame(self, frame):
+        """Scale the cv2 frame to the video area (always returns a new image)"""
+        # Resize to fit frame (maintain aspect ratio)
+        display_w = self.video_frame.winfo_width()
+        display_h = self.video_frame.winfo_height()
+        frame_h, frame_w = frame.shape[:2]
+        
+        if display_w > 10 and display_h > 10:
+            frame_ratio = frame_w / frame_h
+            widget_ratio = display_w / display_h
+
+            if frame_ratio > widget_ratio:
+                new_w = display_w
+                new_h = int(display_w / frame_ratio)
+            else:
+                new_h = display_h
+                new_w = int(display_h * frame_ratio)
+
+            # Scale in OpenCV before the color conversion: AREA when shrinking, LINEAR when enlarging
+            if (new_w, new_h) != (frame_w, frame_h):
+                interpolation = cv2.INTER_AREA if new_w < frame_w else cv2.INTER_LINEAR
+                return cv2.resize(frame, (new_w, new_h), interpolation=interpolation)
+        
+        return frame.copy()
+    
+    def display_frame(self, frame):
+        """Paste a scaled cv2 frame into the reused PhotoImage"""
+        # Convert BGR to RGB (on the already scaled frame)
+        pil_image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        
+        # Reuse the PhotoImage; only a new display size needs a new one
+        if self.video_photo is None or (self.video_photo.width(), self.video_photo.height()) != pil_image.size:
+            self.video_photo = ImageTk.PhotoImage(image=pil_image)
+            self.video_label.configure(image=self.video_photo)
+        else:
+            self.video_photo.paste(pil_image)
+
+    def on_closing(self):
+        """Clean shutdown"""
+        logger.info("Closing application...")
+        self.running = False
+        self.pipeline.stop()
+        self.detector.close()
+        for camera in self.cameras.values():
+            camera.release()
+        for alerts in self.alerts.values():
+            alerts.close()
+        # Flush pending evidence photos / clip frames to disk, then the Telegram alerts they queued
+        self.evidence.close()
+        self.bot.flush()
+        
+        # Stop bot logic if needed
+        # self.bot.stop() # Bot runs in daemon thread, will die with process
+        
+        self.destroy()
+        logger.info("Application closed.")
+
+# --- NEW: PIN Dialog Class ---
+class PinDialog(ctk.CTkToplevel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Security Check")
+        self.geometry("300x200")
+        self.resizable(False, False)
+        
+        # Center dialog
+        self.transient(parent)
+        self.grab_set()
+        
+        ctk.CTkLabel(self, text="🔒 Enter System PIN", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=20)
+        
+        self.pin_entry = ctk.CTkEntry(self, show="*", width=200, justify="center")
+        self.pin_entry.pack(pady=10)
+        self.pin_entry.focus()
+        
+        self.submit_btn = ctk.CTkButton(self, text="Unlock", command=self.check_pin)
+        self.submit_btn.pack(pady=10)
+        
+        self.success = False
+        
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def check_pin(self):
+        # HARDCODED PIN FOR DEMO (You can move this to .env)
+        # For real secure app, hash this.
+        if self.pin_entry.get() == "1234":
+            self.success = True
+            self.destroy()
+        else:
+            self.pin_entry.configure(border_color=Colors.CRITICAL)
+            self.pin_entry.delete(0, 'end')
+
+    def on_close(self):
+        self.destroy()
+
+
+def run():
+    """Starts the GUI behind the PIN dialog (see main.py)."""
+    app = FESSApp()
+    app.withdraw()
+
+    def show_pin_dialog():
+        dialog = PinDialog(app)
+        app.wait_window(dialog)
+
+        if dialog.success:
+            app.deiconify()
+            app.state('zoomed')
+            app.after(200, app.start_system)
+        else:
+            app.destroy()
+
+    app.after(300, show_pin_dialog)
+    app.mainloop()
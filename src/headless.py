@@ -0,0 +1,52 @@
+"""
+Falcon Eye Security System (FESS) - Headless Service Mode
+
+Runs the detection pipeline (cameras -> YOLO -> alerts -> Telegram) without
+any GUI, for servers without a display. Configured from src/config.py / .env.
+
+Usage:
+    python -m src.headless [--sources "0;rtsp://..."] [--disarmed] [--stats-interval 60]
+
+The service itself lives in src/service.py and is imported inside main():
+face workers are started with the spawn method and re-import this module,
+which must not pull in the model or the log setup.
+"""
+
+import argparse
+import signal
+import time
+
+
+def parse_sources(value):
+    """Parses a semicolon-separated source list (same format as CAMERA_SOURCES)."""
+    return [int(x.strip()) if x.strip().isdigit() else x.strip() for x in value.split(";") if x.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Falcon Eye Security System - headless service mode")
+    parser.add_argument("--sources", type=parse_sources, default=None,
+                        help="Semicolon-separated camera indices, RTSP URLs or files (default: CAMERA_SOURCES)")
+    parser.add_argument("--disarmed", action="store_true",
+                        help="Start in monitoring-only mode (arm later with /arm on Telegram)")
+    parser.add_argument("--stats-interval", type=float, default=60.0,
+                        help="Seconds between pipeline statistics log lines (0 disables)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from src.config import CAMERA_SOURCES
+    from src.service import HeadlessService
+
+    service = HeadlessService(args.sources or CAMERA_SOURCES, armed=not args.disarmed)
+    signal.signal(signal.SIGINT, service.stop)
+    signal.signal(signal.SIGTERM, service.stop)
+
+    # Give the camera threads a moment to deliver their first frames
+    time.sleep(1.5)
+    service.run(stats_interval=args.stats_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import numpy as np
+
+# COCO Keypoint Indices
+NOSE = 0
+L_EYE = 1
+R_EYE = 2
+L_WRIST = 9
+R_WRIST = 10
+FACE_KEYPOINTS = slice(0, 5)  # Nose, Eyes, Ears
+
+# Points that trigger a breach when inside the ROI
+CRITICAL_KEYPOINTS = [NOSE, L_WRIST, R_WRIST]
+
+KEYPOINT_CONF = 0.5   # Skip keypoints below this confidence
+FACE_PADDING = 0.8    # Extra margin around the face keypoints to cover the whole head
+
+
+def critical_zone_hits(kpts, zone_mask):
+    """
+    Evaluates the critical keypoints of all persons against the zones at once.
+
+    Args:
+        kpts (ndarray): [N, 17, 3] keypoints (x, y, conf)
+        zone_mask (ZoneMask): Compiled zones for the frame size
+
+    Returns:
+        ndarray: [N] bitmask of the zones entered by any confident critical keypoint
+    """
+    critical = kpts[:, CRITICAL_KEYPOINTS]
+    pixels = critical[..., :2].astype(np.int32)
+    bits = np.where(critical[..., 2] >= KEYPOINT_CONF, zone_mask.lookup(pixels), 0)
+    return np.bitwise_or.reduce(bits, axis=1)
+
+
+def face_boxes(kpts, width, height):
+    """
+    Computes square head boxes from the face keypoints of all persons at once.
+
+    Args:
+        kpts (ndarray): [N, 17, 3] keypoints (x, y, conf)
+        width (int): Frame width
+        height (int): Frame height
+
+    Returns:
+        tuple: (boxes [N, 4] int (x1, y1, x2, y2), valid [N] bool)
+               Persons with fewer than 2 confident face keypoints are not valid.
+    """
+    face = kpts[:, FACE_KEYPOINTS]
+    confident = face[..., 2] > KEYPOINT_CONF
+    valid = np.count_nonzero(confident, axis=1) >= 2
+
+    xs = face[..., 0]
+    ys = face[..., 1]
+    bg_x1 = np.trunc(np.where(confident, xs, np.inf).min(axis=1, initial=np.inf))
+    bg_y1 = np.trunc(np.where(confident, ys, np.inf).min(axis=1, initial=np.inf))
+    bg_x2 = np.trunc(np.where(confident, xs, -np.inf).max(axis=1, initial=-np.inf))
+    bg_y2 = np.trunc(np.where(confident, ys, -np.inf).max(axis=1, initial=-np.inf))
+
+    # Invalid rows hold +/-inf; zero them before the integer math
+    bounds = np.stack([bg_x1, bg_y1, bg_x2, bg_y2], axis=1)
+    bounds = np.where(valid[:, None], bounds, 0).astype(np.int64)
+    bg_x1, bg_y1, bg_x2, bg_y2 = bounds.T
+
+    # Center and enforce a square shape (use max dimension)
+    cx, cy = (bg_x1 + bg_x2) // 2, (bg_y1 + bg_y2) // 2
+    sq_size = np.maximum(bg_x2 - bg_x1, bg_y2 - bg_y1)
+
+    # Add padding to cover the whole head
+    size = sq_size + (sq_size * FACE_PADDING).astype(np.int64)
+    half_size = size // 2
+
+    boxes = np.stack([
+        np.maximum(0, cx - half_size),
+        np.maximum(0, cy - half_size),
+        np.minimum(width, cx + half_size),
+        np.minimum(height, cy + half_size)
+    ], axis=1)
+    return boxes, valid
+
+
+def frontal_faces(kpts):
+    """
+    [N] bool: persons whose nose and both eyes are confident keypoints, i.e.
+    whose face box really shows a face (not the back of the head or a profile).
+    """
+    return np.all(kpts[:, [NOSE, L_EYE, R_EYE], 2] > KEYPOINT_CONF, axis=1)
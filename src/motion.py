@@ -0,0 +1,113 @@
+import time
+import cv2
+import numpy as np
+from src.config import (
+    ACTIVE_HOLD_SECONDS, IDLE_INFERENCE_INTERVAL, MOTION_GATE_ENABLED, MOTION_PIXEL_DELTA, MOTION_THRESHOLD,
+    MOTION_WIDTH, TRACKED_INFERENCE_STRIDE, ZONE_PROXIMITY_MARGIN
+)
+from src.zones import zone_bounds
+
+
+class MotionGate:
+    """
+    Cheap motion detector: differences a small, blurred grayscale copy of
+    each frame against a running-average background.
+    """
+
+    def __init__(self, width=MOTION_WIDTH, threshold=MOTION_THRESHOLD, pixel_delta=MOTION_PIXEL_DELTA):
+        self.width = width
+        self.threshold = threshold      # Fraction of changed pixels that counts as motion
+        self.pixel_delta = pixel_delta  # Grey-level change for a pixel to count as changed
+        self.background = None
+        self.motion_ratio = 0.0
+
+    def update(self, frame):
+        """
+        Feeds one frame to the background model.
+
+        Returns:
+            bool: Whether the frame differs enough from the background
+        """
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        self.motion_ratio = np.count_nonzero(diff > self.pixel_delta) / diff.size
+        # Slow adaptation absorbs lighting drift without hiding people that stop moving
+        cv2.accumulateWeighted(gray, self.background, 0.05)
+        return bool(self.motion_ratio > self.threshold)
+
+
+class InferenceScheduler:
+    """
+    Decides per stream which frames go through YOLO:
+    - a person inside / entering a zone: every frame
+    - persons tracked elsewhere: every TRACKED_INFERENCE_STRIDE frames
+    - empty scene: only on motion, plus one check every IDLE_INFERENCE_INTERVAL
+      seconds (catches people standing still when the gate opened)
+    A person counts as "in a zone" as soon as their box touches the zones'
+    bounding box grown by ZONE_PROXIMITY_MARGIN, so someone walking towards a
+    zone is already inferred at full rate. Full rate is held for
+    ACTIVE_HOLD_SECONDS after a person was last near a zone.
+    """
+
+    def __init__(self, enabled=MOTION_GATE_ENABLED):
+        self.enabled = enabled
+        self.gate = MotionGate()
+        self.mode = "idle"  # "zone" | "tracked" | "idle"
+        self.last_active = 0.0
+        self.last_inference = 0.0
+        self.frames_since_inference = 0
+
+    def should_infer(self, frame, now=None):
+        """Whether this frame should be inferred (the motion model is updated either way)."""
+        if not self.enabled:
+            return True
+
+        now = time.time() if now is None else now
+        motion = self.gate.update(frame)
+        self.frames_since_inference += 1
+
+        if self.mode == "zone" or now - self.last_active < ACTIVE_HOLD_SECONDS:
+            return True
+        if self.mode == "tracked":
+            return self.frames_since_inference >= TRACKED_INFERENCE_STRIDE
+        return motion or now - self.last_inference >= IDLE_INFERENCE_INTERVAL
+
+    def update(self, detections, status, now=None, roi=None, frame_size=None):
+        """
+        Adapts the rate to the result of an inferred frame.
+
+        roi / frame_size ((height, width) of the frame the boxes refer to)
+        enable the proximity test; without them only persons inside a zone count.
+        """
+        now = time.time() if now is None else now
+        self.last_inference = now
+        self.frames_since_inference = 0
+
+        if status != "SAFE" or any(det["zones"] or self.near_zone(det["bbox"], roi, frame_size) for det in detections):
+            self.mode = "zone"
+            self.last_active = now
+        elif detections:
+            self.mode = "tracked"
+        else:
+            self.mode = "idle"
+
+    @staticmethod
+    def near_zone(bbox, roi, frame_size, margin=ZONE_PROXIMITY_MARGIN):
+        """Whether a person box intersects the zones' bounding box grown by `margin` (fraction of the frame)."""
+        if roi is None or frame_size is None:
+            return False
+        bounds = zone_bounds(roi, margin)
+        if bounds is None:
+            return False
+        height, width = frame_size
+        x1, y1, x2, y2 = bbox
+        return (x1 <= bounds[2] * width and x2 >= bounds[0] * width
+                and y1 <= bounds[3] * height and y2 >= bounds[1] * height)
@@ -1,11 +1,29 @@
 import asyncio
 import threading
 import time
-from telegram import Update
+from collections import deque
+from pathlib import Path
+from telegram import InputMediaPhoto, Update
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
 from telegram.ext import Application, CommandHandler, ContextTypes
-from src.config import TELEGRAM_TOKEN, CHAT_ID, ALLOWED_TELEGRAM_IDS, logger
+from src.config import (TELEGRAM_TOKEN, CHAT_ID, ALLOWED_TELEGRAM_IDS, TELEGRAM_BATCH_WINDOW, TELEGRAM_CHAT_INTERVAL,
+                        TELEGRAM_GROUP_INTERVAL, TELEGRAM_MAX_ATTEMPTS, TELEGRAM_QUEUE_SIZE, TELEGRAM_RETRY_MAX,
+                        TELEGRAM_RETRY_MIN, logger)
+
+MEDIA_GROUP_MAX = 10  # Telegram limit of photos per media group
 
 class TelegramBot:
+    """
+    Telegram command bot (/arm, /disarm) and alert sender, running on its
+    own asyncio loop thread.
+
+    Alerts go through an outbound delivery queue: bursts (e.g. several
+    cameras firing at once) are coalesced into one media group, each chat is
+    rate limited below Telegram's flood limits and failed sends are retried
+    with exponential backoff (honouring RetryAfter). Alerts that are dropped
+    or fail for good are logged and counted in `stats`.
+    """
+
     def __init__(self):
         self.token = TELEGRAM_TOKEN
         self.chat_id = CHAT_ID
@@ -15,6 +33,27 @@ class TelegramBot:
         self.thread = None
         self.running = False
 
+        # Outbound delivery queue: filled from any thread, drained on the bot loop
+        self.pending = deque()
+        self.pending_lock = threading.Lock()
+        self.in_flight = 0
+        self.wakeup = None  # asyncio.Event of the bot loop
+        self.delivery_task = None
+        self.next_send = {}  # {chat_id: loop time of the next allowed message}
+        self.last_batch_time = 0  # When the last batch was taken from the queue
+
+        # Statistics (latency = queued -> delivered, seconds)
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'batches': 0,
+            'retries': 0,
+            'failed': 0,
+            'dropped': 0,
+            'latency_avg': 0.0,
+            'latency_max': 0.0
+        }
+
     def start(self):
         """Starts the bot in a separate thread."""
         if not self.token or self.token == "your_token_here":
@@ -77,11 +116,19 @@ class TelegramBot:
         
         # start_polling() is non-blocking (it creates a background task)
         await self.application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+
+        # Alert delivery worker (alerts queued while offline are sent now)
+        self.wakeup = asyncio.Event()
+        self.delivery_task = asyncio.get_running_loop().create_task(self._delivery_loop())
+        if self.pending:
+            self.wakeup.set()
         
         logger.info("🦅 Telegram Bot is Online and Polling!")
 
     async def _shutdown_bot(self):
         """Stops the bot gracefully."""
+        if self.delivery_task:
+            self.delivery_task.cancel()
         if self.application:
             logger.info("Stopping Telegram Bot...")
             await self.application.updater.stop()
@@ -122,37 +169,161 @@ class TelegramBot:
         logger.info(f"System Disarmed via Telegram by {update.effective_user.first_name}")
 
     # --- Alert Logic ---
-    async def _send_alert_coroutine(self, image_path, message):
-        """The actual async function that sends the photo."""
+    @property
+    def queue_depth(self):
+        """Alerts waiting for delivery (including the batch being sent)."""
+        return len(self.pending) + self.in_flight
+
+    def send_alert(self, photo, message, chat_id=None):
+        """
+        Thread-safe: queues a photo alert for delivery. `photo` is an encoded
+        image (bytes, a cv2.imencode buffer or BytesIO) or the path of an image
+        file (read once, here). Alerts queued while the bot is still connecting
+        are sent once it is online.
+
+        Returns:
+            bool: False if the alert could not be queued
+        """
+        chat_id = chat_id or self.chat_id
+        if not self.running or not chat_id:
+            logger.warning("Telegram alert skipped: bot disabled or CHAT_ID not set.")
+            self.stats['dropped'] += 1
+            return False
+
         try:
-            if not self.chat_id:
-                logger.warning("Cannot send alert: CHAT_ID not set.")
+            photo = self.photo_bytes(photo)
+        except OSError as e:
+            logger.error(f"Failed to read alert photo {photo}: {e}")
+            self.stats['failed'] += 1
+            return False
+
+        alert = {'chat_id': chat_id, 'photo': photo, 'caption': message, 'queued': time.time()}
+        with self.pending_lock:
+            if len(self.pending) >= TELEGRAM_QUEUE_SIZE:
+                dropped = self.pending.popleft()
+                self.stats['dropped'] += 1
+                logger.warning(f"Telegram queue full, dropped the alert queued at {time.ctime(dropped['queued'])}")
+            self.pending.append(alert)
+            self.stats['queued'] += 1
+
+        if self.loop and self.wakeup:
+            try:
+                self.loop.call_soon_threadsafe(self.wakeup.set)
+            except RuntimeError:
+                pass  # Loop closed (shutting down)
+        return True
+
+    @staticmethod
+    def photo_bytes(photo):
+        """Encoded photo (path, bytes-like, numpy buffer or BytesIO) -> bytes"""
+        if isinstance(photo, (str, Path)):
+            return Path(photo).read_bytes()
+        if hasattr(photo, "getvalue"):
+            return photo.getvalue()
+        return bytes(photo)
+
+    def flush(self, timeout=10.0):
+        """Waits up to `timeout` seconds for queued alerts to be delivered (call before exiting)."""
+        deadline = time.time() + timeout
+        while self.queue_depth and self.loop and self.loop.is_running() and time.time() < deadline:
+            time.sleep(0.1)
+        if self.queue_depth:
+            logger.warning(f"{self.queue_depth} Telegram alert(s) not delivered.")
+
+    def chat_interval(self, chat_id):
+        """Min seconds between messages to a chat (group chat ids are negative)."""
+        return TELEGRAM_GROUP_INTERVAL if str(chat_id).startswith("-") else TELEGRAM_CHAT_INTERVAL
+
+    async def _delivery_loop(self):
+        """Drains the alert queue, one chat batch at a time."""
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+
+            while self.pending:
+                # A lone alert goes out at once. During a burst (several alerts pending, or
+                # one right after the previous batch) let it gather into one media group.
+                burst = len(self.pending) > 1 or time.time() - self.last_batch_time < TELEGRAM_BATCH_WINDOW
+                age = time.time() - self.pending[0]['queued']
+                if burst and age < TELEGRAM_BATCH_WINDOW:
+                    await asyncio.sleep(TELEGRAM_BATCH_WINDOW - age)
+
+                batch = self._take_batch()
+                self.last_batch_time = time.time()
+                try:
+                    await self._deliver(batch)
+                finally:
+                    self.in_flight = 0
+
+    def _take_batch(self):
+        """Takes the oldest alert and up to MEDIA_GROUP_MAX - 1 more for the same chat."""
+        with self.pending_lock:
+            chat_id = self.pending[0]['chat_id']
+            batch, rest = [], deque()
+            while self.pending:
+                alert = self.pending.popleft()
+                if alert['chat_id'] == chat_id and len(batch) < MEDIA_GROUP_MAX:
+                    batch.append(alert)
+                else:
+                    rest.append(alert)
+            self.pending = rest
+            self.in_flight = len(batch)
+        return batch
+
+    async def _deliver(self, batch):
+        """Sends one batch, rate limited per chat and retried on network errors."""
+        loop = asyncio.get_running_loop()
+        chat_id = batch[0]['chat_id']
+
+        for attempt in range(1, TELEGRAM_MAX_ATTEMPTS + 1):
+            wait = self.next_send.get(chat_id, 0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # A media group counts as one message per photo towards the flood limit
+            self.next_send[chat_id] = loop.time() + self.chat_interval(chat_id) * len(batch)
+
+            try:
+                await self._send(chat_id, batch)
+            except RetryAfter as e:
+                delay = e.retry_after
+                delay = delay.total_seconds() if hasattr(delay, "total_seconds") else float(delay)
+                logger.warning(f"Telegram flood control: retrying in {delay:.0f}s")
+                self.next_send[chat_id] = loop.time() + delay
+            except (BadRequest, Forbidden) as e:
+                logger.error(f"Telegram rejected {len(batch)} alert(s): {e}")
+                break
+            except NetworkError as e:
+                delay = min(TELEGRAM_RETRY_MIN * 2 ** (attempt - 1), TELEGRAM_RETRY_MAX)
+                logger.warning(f"Failed to send Telegram alert ({e}), attempt {attempt}/{TELEGRAM_MAX_ATTEMPTS}")
+                self.next_send[chat_id] = loop.time() + delay
+            except Exception as e:
+                logger.error(f"Failed to send Telegram alert: {e}")
+                break
+            else:
+                self._record_delivery(batch)
+                logger.info(f"Alert sent to {chat_id} ({len(batch)} photo(s))")
                 return
 
-            # Open file in binary mode
-            with open(image_path, 'rb') as photo:
-                await self.application.bot.send_photo(
-                    chat_id=self.chat_id, 
-                    photo=photo, 
-                    caption=message
-                )
-            logger.info(f"Alert sent to {self.chat_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send Telegram alert: {e}")
+            if attempt < TELEGRAM_MAX_ATTEMPTS:
+                self.stats['retries'] += 1
 
-    def send_alert(self, image_path, message):
-        """
-        Thread-safe method to trigger an alert from the main thread.
-        Schedules the coroutine on the bot's event loop.
-        """
-        if self.loop and self.loop.is_running():
-            # Schedule the coroutine to run on the loop
-            asyncio.run_coroutine_threadsafe(
-                self._send_alert_coroutine(image_path, message), 
-                self.loop
-            )
+        self.stats['failed'] += len(batch)
+        logger.error(f"{len(batch)} Telegram alert(s) could not be delivered.")
+
+    async def _send(self, chat_id, batch):
+        if len(batch) == 1:
+            await self.application.bot.send_photo(chat_id=chat_id, photo=batch[0]['photo'], caption=batch[0]['caption'])
         else:
-            logger.warning("Telegram Bot loop is not running. Alert skipped.")
+            media = [InputMediaPhoto(alert['photo'], caption=alert['caption']) for alert in batch]
+            await self.application.bot.send_media_group(chat_id=chat_id, media=media)
+
+    def _record_delivery(self, batch):
+        now = time.time()
+        self.stats['batches'] += 1
+        for alert in batch:
+            latency = now - alert['queued']
+            self.stats['sent'] += 1
+            self.stats['latency_avg'] += (latency - self.stats['latency_avg']) / self.stats['sent']
+            self.stats['latency_max'] = max(self.stats['latency_max'], latency)
 
 TelegramNotifier = TelegramBot
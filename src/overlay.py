@@ -0,0 +1,92 @@
+import time
+from datetime import datetime
+import cv2
+import numpy as np
+
+BAR_HEIGHT = 60
+BAR_COLOR = (10, 14, 39)  # BGR
+BAR_OPACITY = 0.7
+SPAN_GAP = 32  # Text columns closer than this are blended as one span
+
+
+class StatusOverlay:
+    """
+    Status bar drawn over the top of the live feed (armed state, REC,
+    timestamp).
+
+    Only the bar rows are touched: they are blended in place with a cached
+    solid bar, and the text is pre-rendered into a cached layer (with its
+    anti-aliasing coverage) that is rebuilt only when the state changes or the
+    clock ticks to a new second. The text is alpha-blended over the column
+    spans it occupies, so its anti-aliased edges blend into the bar.
+    """
+
+    def __init__(self, height=BAR_HEIGHT):
+        self.height = height
+        self.bar = None         # Solid bar color, [height, width, 3]
+        self.text = None        # Pre-rendered text pixels (drawn on black, i.e. premultiplied by coverage)
+        self.text_inv_alpha = None  # 255 - text coverage, [height, width, 3]
+        self.text_spans = []    # Column slices that contain text
+        self.text_key = None    # (width, height, armed, recording, second) the text layer was rendered for
+
+    def draw(self, frame, armed, recording):
+        """Draws the status bar on the frame in place."""
+        width = frame.shape[1]
+        bar = frame[:self.height]
+        height = bar.shape[0]
+
+        if self.bar is None or self.bar.shape[:2] != (height, width):
+            self.bar = np.empty((height, width, 3), dtype=np.uint8)
+            self.bar[:] = BAR_COLOR
+
+        # Semi-transparent status bar (slice-level blend, no full-frame copy)
+        cv2.addWeighted(self.bar, BAR_OPACITY, bar, 1 - BAR_OPACITY, 0, dst=bar)
+
+        second = int(time.time())
+        key = (width, height, armed, recording, second)
+        if key != self.text_key:
+            self.render_text(width, height, armed, recording, second)
+            self.text_key = key
+
+        # bar = bar * (1 - alpha) + text, on the text columns only
+        for span in self.text_spans:
+            region = bar[:, span]
+            cv2.multiply(region, self.text_inv_alpha[:, span], dst=region, scale=1 / 255)
+            cv2.add(region, self.text[:, span], dst=region)
+
+    def render_text(self, width, height, armed, recording, second):
+        """Pre-renders the bar text (status, REC, timestamp) and its coverage into the cached layer."""
+        text = np.zeros((height, width, 3), dtype=np.uint8)
+        alpha = np.zeros((height, width), dtype=np.uint8)
+
+        def put_text(string, origin, scale, color, thickness, line_type=cv2.LINE_8):
+            cv2.putText(text, string, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness, line_type)
+            cv2.putText(alpha, string, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness, line_type)
+
+        # System status text
+        status_text = "● ARMED" if armed else "○ STANDBY"
+        status_color = (0, 230, 118) if armed else (144, 164, 174)
+        put_text(status_text, (20, 38), 0.9, status_color, 2, cv2.LINE_AA)
+
+        # Recording Indicator
+        if recording:
+            cv2.circle(text, (width - 300, 30), 10, (0, 0, 255), -1)
+            cv2.circle(alpha, (width - 300, 30), 10, 255, -1)
+            put_text("REC", (width - 280, 38), 0.7, (0, 0, 255), 2)
+
+        # Timestamp
+        timestamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        put_text(timestamp, (width - 250, 38), 0.6, (176, 190, 197), 1, cv2.LINE_AA)
+
+        # Column ranges with ink (gaps between letters merged: fewer, larger blends)
+        inked = np.flatnonzero(np.diff(np.concatenate(([0], alpha.any(axis=0).astype(np.int8), [0]))))
+        spans = []
+        for start, end in zip(inked[::2].tolist(), inked[1::2].tolist()):
+            if spans and start - spans[-1][1] < SPAN_GAP:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end])
+        self.text_spans = [slice(start, end) for start, end in spans]
+
+        self.text = text
+        self.text_inv_alpha = cv2.cvtColor(255 - alpha, cv2.COLOR_GRAY2BGR)
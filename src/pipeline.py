@@ -0,0 +1,225 @@
+import queue
+import threading
+import time
+from src.camera import FramePool
+from src.config import PIPELINE_QUEUE_SIZE, ROI_ZONES, logger
+from src.motion import InferenceScheduler
+from src.threads import pin_current_thread
+
+
+class DetectionPipeline:
+    """
+    Staged detection pipeline: capture -> inference -> decision -> render.
+
+    - Capture: each camera's own reader thread (ThreadedCamera ring buffer);
+      the inference stage sleeps until any camera publishes a new frame
+    - Inference: runs one batched MultiStreamDetector.detect_frames call over
+      the latest frame of every stream in a dedicated thread. A per-stream
+      InferenceScheduler (motion gate) lets idle streams skip inference; their
+      frames pass through with `skipped` set and only the zones drawn
+    - Decision: runs the alerting handler (AlertManager.process) in its own thread
+    - Render: the consumer (GUI) polls already-annotated results with get_result()
+
+    Stages are connected by bounded queues. When a queue is full the oldest
+    item is dropped, so a slow stage never stalls the ones before it and every
+    stage runs at its own rate.
+    """
+
+    def __init__(self, cameras, detector, roi_points=ROI_ZONES, decision_handler=None,
+                 queue_size=PIPELINE_QUEUE_SIZE, render=True):
+        """
+        Args:
+            cameras (dict): {stream_id: ThreadedCamera}
+            detector (MultiStreamDetector): Shared detector with one ObjectDetector per stream
+            roi_points (list | dict): ROI points / zone list for every stream, or {stream_id: zones}
+            decision_handler (callable): Called with each result on the decision thread
+            queue_size (int): Results buffered per stream between stages
+            render (bool): Queue results for get_result() (False in headless mode)
+        """
+        self.cameras = cameras
+        self.detector = detector
+        if isinstance(roi_points, dict):
+            self.roi_points = roi_points
+        else:
+            self.roi_points = {stream_id: roi_points for stream_id in cameras}
+        self.decision_handler = decision_handler
+        self.render = render
+
+        self.decision_queue = queue.Queue(maxsize=queue_size * len(cameras))
+        self.render_queue = queue.Queue(maxsize=queue_size * len(cameras))
+
+        self.running = False
+        self.threads = []
+
+        # Set by every camera on a new frame, so the inference stage never busy-polls
+        self.frame_event = threading.Event()
+        for camera in cameras.values():
+            camera.subscribe(self.frame_event)
+        self.last_seq = {stream_id: 0 for stream_id in cameras}
+        self.frame_pools = {stream_id: FramePool() for stream_id in cameras}
+        self.schedulers = {stream_id: InferenceScheduler() for stream_id in cameras}
+
+        # Raw (un-annotated) frame capture on request, e.g. for face enrolment
+        self._snapshot_stream = None
+        self._snapshot_requested = threading.Event()
+        self._snapshot_ready = threading.Event()
+        self._snapshot = None
+
+        # Statistics
+        self.stats = {
+            'inferred_frames': 0,
+            'skipped_frames': 0,
+            'decision_drops': 0,
+            'render_drops': 0,
+            'inference_ms': 0.0
+        }
+
+    def start(self):
+        """Starts the inference and decision threads."""
+        if self.running:
+            return
+
+        self.running = True
+        for name, target in (("fess-inference", self._inference_loop),
+                             ("fess-decision", self._decision_loop)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info("Detection pipeline started.")
+
+    def stop(self, timeout=2.0):
+        """Stops the stage threads and waits for them to finish."""
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        self.threads.clear()
+        logger.info("Detection pipeline stopped.")
+
+    def get_result(self):
+        """
+        Returns the next annotated result for rendering, or None.
+
+        Result dict keys: stream_id, frame, detections, status, timestamp,
+        capture_time, seq, inference_ms, skipped
+        """
+        try:
+            return self.render_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def snapshot(self, stream_id=None, timeout=1.0):
+        """Returns a copy of the next raw frame (before annotation) of a stream, or None."""
+        self._snapshot_stream = stream_id if stream_id is not None else next(iter(self.cameras))
+        self._snapshot_ready.clear()
+        self._snapshot_requested.set()
+        if not self._snapshot_ready.wait(timeout):
+            self._snapshot_requested.clear()
+            return None
+        return self._snapshot
+
+    def _put_latest(self, q, item, drop_key):
+        """Puts an item on a bounded queue, dropping the oldest item when full."""
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    self.stats[drop_key] += 1
+                except queue.Empty:
+                    pass
+
+    def _inference_loop(self):
+        # Exported runtimes create their thread pools on the first predict, here, inheriting the mask
+        pin_current_thread("inference")
+        while self.running:
+            # Clear before collecting: a frame published meanwhile sets it again
+            self.frame_event.clear()
+
+            frames = {}
+            detection_frames = {}
+            captured = {}
+            for stream_id, camera in self.cameras.items():
+                pool = self.frame_pools[stream_id]
+                seq, capture_time, frame, detection_frame = camera.read_latest(self.last_seq[stream_id], pool.get())
+                if frame is not None:
+                    pool.keep(frame)
+                    self.last_seq[stream_id] = seq
+                    frames[stream_id] = frame
+                    detection_frames[stream_id] = detection_frame
+                    captured[stream_id] = (seq, capture_time)
+
+            if not frames:
+                self.frame_event.wait(0.1)
+                continue
+
+            if self._snapshot_requested.is_set() and self._snapshot_stream in frames:
+                self._snapshot = frames[self._snapshot_stream].copy()
+                self._snapshot_requested.clear()
+                self._snapshot_ready.set()
+
+            # Motion gate / adaptive rate: only due streams go into the batch
+            now = time.time()
+            due = {}
+            skipped = {}
+            for stream_id, frame in frames.items():
+                gate_frame = detection_frames[stream_id] if detection_frames[stream_id] is not None else frame
+                if self.schedulers[stream_id].should_infer(gate_frame, now):
+                    due[stream_id] = frame
+                else:
+                    skipped[stream_id] = frame
+
+            outputs = {}
+            inference_ms = 0.0
+            if due:
+                start = time.perf_counter()
+                try:
+                    outputs = self.detector.detect_frames(due, self.roi_points, detection_frames)
+                except Exception as e:
+                    logger.error(f"Error in inference stage: {e}")
+                    continue
+                inference_ms = (time.perf_counter() - start) * 1000
+
+                self.stats['inferred_frames'] += len(outputs)
+                self.stats['inference_ms'] = inference_ms
+                for stream_id, (processed_frame, detections, status) in outputs.items():
+                    self.schedulers[stream_id].update(detections, status, now, self.roi_points[stream_id],
+                                                      processed_frame.shape[:2])
+
+            if skipped:
+                self.stats['skipped_frames'] += len(skipped)
+                outputs.update(self.detector.passthrough_frames(skipped, self.roi_points))
+
+            timestamp = time.time()
+            for stream_id, (processed_frame, detections, status) in outputs.items():
+                seq, capture_time = captured[stream_id]
+                result = {
+                    "stream_id": stream_id,
+                    "frame": processed_frame,
+                    "detections": detections,
+                    "status": status,
+                    "timestamp": timestamp,
+                    "capture_time": capture_time,
+                    "seq": seq,
+                    "inference_ms": inference_ms if stream_id in due else 0.0,
+                    "skipped": stream_id in skipped
+                }
+                self._put_latest(self.decision_queue, result, 'decision_drops')
+
+    def _decision_loop(self):
+        pin_current_thread("decision")
+        while self.running:
+            try:
+                result = self.decision_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if self.decision_handler:
+                try:
+                    self.decision_handler(result)
+                except Exception as e:
+                    logger.error(f"Error in decision stage: {e}")
+
+            if self.render:
+                self._put_latest(self.render_queue, result, 'render_drops')
@@ -0,0 +1,295 @@
+"""
+Falcon Eye Security System (FESS) - INT8 Model Quantization
+
+Produces a post-training INT8 OpenVINO version of the pose model, calibrated
+on frames from our own evidence (logs/ photos and clips), and validates it
+against the FP32 model on a recorded clip: box agreement, nose / wrist
+keypoint error and breach decision agreement (the inputs of the alert logic).
+
+Usage:
+    python -m src.quantize export [--calibration logs] [--limit 300]
+    python -m src.quantize validate --clip clip.mp4 [--frames 300] [--max-kpt-error 8]
+
+Load the result with INFERENCE_BACKEND=openvino-int8.
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+from ultralytics.data.augment import LetterBox
+
+from src.backends import exported_model_path, export_model, load_backend
+from src.config import INFERENCE_SIZE, LOGS_DIR, MODEL_PATH, ROI_ZONES, logger
+from src.detector import predict_persons
+from src.keypoints import KEYPOINT_CONF, L_WRIST, NOSE, R_WRIST, critical_zone_hits
+from src.zones import get_zone_mask
+
+# Optional: only needed to quantize (not to run) the INT8 model
+QUANTIZATION_AVAILABLE = False
+try:
+    import nncf
+    import openvino as ov
+    QUANTIZATION_AVAILABLE = True
+except ImportError:
+    nncf = None
+    ov = None
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+VIDEO_EXTENSIONS = (".avi", ".mp4", ".mkv")
+VALIDATED_KEYPOINTS = {"nose": NOSE, "left_wrist": L_WRIST, "right_wrist": R_WRIST}
+
+
+def calibration_frames(directory, limit, video_stride=15):
+    """Collects up to `limit` BGR frames from the photos and clips in a directory."""
+    frames = []
+    paths = sorted(Path(directory).iterdir()) if Path(directory).is_dir() else []
+
+    for path in paths:
+        if len(frames) >= limit:
+            break
+        suffix = path.suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                frames.append(frame)
+        elif suffix in VIDEO_EXTENSIONS:
+            capture = cv2.VideoCapture(str(path))
+            index = 0
+            while len(frames) < limit:
+                ret, frame = capture.read()
+                if not ret:
+                    break
+                if index % video_stride == 0:
+                    frames.append(frame)
+                index += 1
+            capture.release()
+
+    return frames
+
+
+def preprocess(frame, imgsz=INFERENCE_SIZE):
+    """Same input transform as the ultralytics predictor: letterbox, BGR->RGB, CHW, [0, 1]."""
+    image = LetterBox((imgsz, imgsz), auto=False)(image=frame)
+    image = image[..., ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(image, dtype=np.float32)[None] / 255.0
+
+
+def quantize(model_path=MODEL_PATH, calibration_dir=LOGS_DIR, limit=300, imgsz=INFERENCE_SIZE):
+    """
+    Quantizes the FP32 OpenVINO export of the model to INT8 (NNCF post-training quantization).
+
+    Returns:
+        Path: The INT8 model directory (models/<name>_int8_openvino_model)
+    """
+    if not QUANTIZATION_AVAILABLE:
+        raise RuntimeError("Quantization needs nncf and openvino: pip install nncf openvino")
+
+    frames = calibration_frames(calibration_dir, limit)
+    if not frames:
+        raise RuntimeError(f"No calibration images or clips found in {calibration_dir}")
+    if len(frames) < 50:
+        logger.warning(f"Only {len(frames)} calibration frames; 100-300 varied frames give better INT8 accuracy.")
+    logger.info(f"Calibrating on {len(frames)} frames from {calibration_dir}")
+
+    fp32_dir = exported_model_path(model_path, "openvino")
+    if not fp32_dir.exists():
+        fp32_dir = export_model(model_path, "openvino")
+    fp32_xml = next(fp32_dir.glob("*.xml"))
+
+    # Keep the box / keypoint decoding of the head in float (as ultralytics' own INT8 export does)
+    head = f"model.{len(YOLO(model_path).model.model) - 1}"
+    ignored_scope = nncf.IgnoredScope(
+        patterns=[
+            f".*{head}/.*/Add", f".*{head}/.*/Sub*", f".*{head}/.*/Mul*", f".*{head}/.*/Div*", f".*{head}\\.dfl.*"
+        ],
+        types=["Sigmoid"],
+        validate=False
+    )
+
+    dataset = nncf.Dataset(frames, lambda frame: preprocess(frame, imgsz))
+    quantized = nncf.quantize(
+        ov.Core().read_model(fp32_xml),
+        dataset,
+        preset=nncf.QuantizationPreset.MIXED,
+        subset_size=len(frames),
+        ignored_scope=ignored_scope
+    )
+
+    target = exported_model_path(model_path, "openvino-int8")
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+    ov.save_model(quantized, str(target / fp32_xml.name), compress_to_fp16=False)
+    # ultralytics reads task, names and kpt_shape from the metadata next to the IR
+    shutil.copy(fp32_dir / "metadata.yaml", target / "metadata.yaml")
+
+    logger.success(f"INT8 model saved: {target}")
+    return target
+
+
+def box_iou(a, b):
+    """Pairwise IoU of two [N, 4] / [M, 4] xyxy box arrays -> [N, M]"""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def match_persons(reference, candidate, min_iou=0.5):
+    """Greedy one-to-one matching by IoU. Returns [(ref_idx, cand_idx, iou), ...]"""
+    if len(reference) == 0 or len(candidate) == 0:
+        return []
+    iou = box_iou(reference, candidate)
+    pairs = []
+    while True:
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] < min_iou:
+            return pairs
+        pairs.append((i, j, float(iou[i, j])))
+        iou[i, :] = -1
+        iou[:, j] = -1
+
+
+def result_arrays(result):
+    if result.boxes is None or len(result.boxes) == 0:
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0, 17, 3), dtype=np.float32)
+    return result.boxes.xyxy.cpu().numpy(), result.keypoints.data.cpu().numpy()
+
+
+def validate(clip, reference_model, candidate_model, frames=300, stride=1, imgsz=INFERENCE_SIZE):
+    """
+    Runs both models over a clip and compares their outputs.
+
+    Returns:
+        dict: Agreement report (see print_report)
+    """
+    capture = cv2.VideoCapture(str(clip))
+    report = {
+        "frames": 0, "reference_persons": 0, "candidate_persons": 0, "matched": 0, "ious": [],
+        "keypoint_errors": {name: [] for name in VALIDATED_KEYPOINTS},
+        "keypoint_visibility_agree": 0, "keypoint_pairs": 0,
+        "breach_agree": 0, "frame_status_agree": 0
+    }
+
+    index = 0
+    while report["frames"] < frames:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        index += 1
+        if (index - 1) % stride:
+            continue
+
+        height, width = frame.shape[:2]
+        zone_mask = get_zone_mask(ROI_ZONES, width, height)
+        ref_boxes, ref_kpts = result_arrays(predict_persons(reference_model, [frame], imgsz)[0])
+        cand_boxes, cand_kpts = result_arrays(predict_persons(candidate_model, [frame], imgsz)[0])
+
+        report["frames"] += 1
+        report["reference_persons"] += len(ref_boxes)
+        report["candidate_persons"] += len(cand_boxes)
+
+        ref_bits = critical_zone_hits(ref_kpts, zone_mask)
+        cand_bits = critical_zone_hits(cand_kpts, zone_mask)
+        ref_status = zone_mask.severity(ref_bits).max(initial=0)
+        cand_status = zone_mask.severity(cand_bits).max(initial=0)
+        report["frame_status_agree"] += int(ref_status == cand_status)
+
+        for i, j, iou in match_persons(ref_boxes, cand_boxes):
+            report["matched"] += 1
+            report["ious"].append(iou)
+            report["breach_agree"] += int(ref_bits[i] == cand_bits[j])
+
+            for name, k in VALIDATED_KEYPOINTS.items():
+                ref_visible = ref_kpts[i, k, 2] >= KEYPOINT_CONF
+                cand_visible = cand_kpts[j, k, 2] >= KEYPOINT_CONF
+                report["keypoint_pairs"] += 1
+                report["keypoint_visibility_agree"] += int(ref_visible == cand_visible)
+                if ref_visible and cand_visible:
+                    report["keypoint_errors"][name].append(float(np.linalg.norm(ref_kpts[i, k, :2] - cand_kpts[j, k, :2])))
+
+    capture.release()
+    return report
+
+
+def print_report(report, max_kpt_error, min_agreement):
+    """Prints the validation report. Returns True if the INT8 model passes."""
+    frames = max(report["frames"], 1)
+    matched = max(report["matched"], 1)
+    recall = report["matched"] / max(report["reference_persons"], 1)
+    precision = report["matched"] / max(report["candidate_persons"], 1)
+    breach_agreement = report["breach_agree"] / matched
+    status_agreement = report["frame_status_agree"] / frames
+
+    print(f"Frames: {report['frames']}  persons FP32 / INT8: {report['reference_persons']} / "
+          f"{report['candidate_persons']}  matched: {report['matched']}")
+    print(f"Box agreement: recall {recall:.3f}, precision {precision:.3f}, "
+          f"mean IoU {np.mean(report['ious']) if report['ious'] else 0:.3f}")
+    print(f"Keypoint visibility agreement: {report['keypoint_visibility_agree'] / max(report['keypoint_pairs'], 1):.3f}")
+
+    passed = True
+    for name, errors in report["keypoint_errors"].items():
+        if not errors:
+            print(f"  {name:>12}: no confident pairs")
+            continue
+        p95 = float(np.percentile(errors, 95))
+        print(f"  {name:>12}: mean {np.mean(errors):.2f} px, p95 {p95:.2f} px, max {np.max(errors):.2f} px")
+        passed &= p95 <= max_kpt_error
+
+    print(f"Breach zone agreement (per person): {breach_agreement:.4f}")
+    print(f"Frame status agreement: {status_agreement:.4f}")
+    passed &= breach_agreement >= min_agreement and status_agreement >= min_agreement and recall >= min_agreement
+
+    print("PASS" if passed else "FAIL")
+    return passed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="FESS INT8 model quantization and validation")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Calibrate and save the INT8 OpenVINO model")
+    export.add_argument("--model", default=MODEL_PATH)
+    export.add_argument("--calibration", default=str(LOGS_DIR), help="Directory of photos / clips (default: logs/)")
+    export.add_argument("--limit", type=int, default=300, help="Max calibration frames")
+    export.add_argument("--imgsz", type=int, default=INFERENCE_SIZE)
+
+    check = commands.add_parser("validate", help="Compare the INT8 model with the FP32 model on a clip")
+    check.add_argument("--clip", required=True, help="Recorded video to compare on")
+    check.add_argument("--model", default=MODEL_PATH, help="FP32 reference (.pt)")
+    check.add_argument("--candidate", default=None, help="Model to check (default: the cached INT8 model)")
+    check.add_argument("--frames", type=int, default=300)
+    check.add_argument("--stride", type=int, default=1, help="Use every Nth frame of the clip")
+    check.add_argument("--imgsz", type=int, default=INFERENCE_SIZE)
+    check.add_argument("--max-kpt-error", type=float, default=8.0, help="Max p95 nose/wrist error (pixels)")
+    check.add_argument("--min-agreement", type=float, default=0.98, help="Min breach / status agreement and recall")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == "export":
+        quantize(args.model, args.calibration, args.limit, args.imgsz)
+        return 0
+
+    candidate_path = args.candidate or exported_model_path(args.model, "openvino-int8")
+    if not Path(candidate_path).exists():
+        logger.error(f"{candidate_path} not found; run: python -m src.quantize export")
+        return 1
+
+    reference = load_backend("torch", args.model)
+    candidate = YOLO(str(candidate_path), task="pose")
+    report = validate(args.clip, reference, candidate, args.frames, args.stride, args.imgsz)
+    return 0 if print_report(report, args.max_kpt_error, args.min_agreement) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
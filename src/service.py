@@ -0,0 +1,115 @@
+"""
+Falcon Eye Security System (FESS) - Headless service
+
+The detection pipeline (cameras -> YOLO -> alerts -> Telegram) without any
+GUI. Started with `python -m src.headless`.
+"""
+
+import threading
+
+from src.config import ROI_ZONES, STREAM_ROI_ZONES, logger
+from src.alerts import AlertManager
+from src.camera import ThreadedCamera
+from src.detector import MultiStreamDetector
+from src.evidence import EvidenceWriter
+from src.notifier import TelegramBot
+from src.pipeline import DetectionPipeline
+from src.threads import configure_threads
+
+
+class HeadlessService:
+    """
+    Wires cameras, the shared detector, per-stream alert managers and the
+    Telegram bot into a DetectionPipeline with no render stage.
+    """
+
+    def __init__(self, sources, armed=True):
+        self.stream_ids = [f"cam{i}" for i in range(len(sources))]
+        self.stop_event = threading.Event()
+
+        configure_threads()
+        self.detector = MultiStreamDetector(self.stream_ids)
+
+        self.bot = TelegramBot()
+        self.bot.start()
+        self.bot.is_armed = armed
+
+        self.evidence = EvidenceWriter()
+        multi_camera = len(self.stream_ids) > 1
+        self.alerts = {
+            stream_id: AlertManager(
+                self.bot,
+                on_log=self.log_event,
+                camera_name=stream_id if multi_camera else None,
+                evidence=self.evidence
+            )
+            for stream_id in self.stream_ids
+        }
+
+        self.cameras = {}
+        for stream_id, source in zip(self.stream_ids, sources):
+            logger.info(f"Connecting to camera {stream_id}: {source}")
+            self.cameras[stream_id] = ThreadedCamera(source)
+
+        self.pipeline = DetectionPipeline(
+            self.cameras,
+            self.detector,
+            {stream_id: STREAM_ROI_ZONES.get(stream_id, ROI_ZONES) for stream_id in self.stream_ids},
+            decision_handler=self.handle_result,
+            render=False
+        )
+
+    def log_event(self, message, level="info"):
+        """AlertManager feedback goes to the log instead of the GUI activity box"""
+        log_level = {"success": "SUCCESS", "warning": "WARNING", "critical": "WARNING"}.get(level, "INFO")
+        logger.log(log_level, message)
+
+    def handle_result(self, result):
+        # The Telegram /arm and /disarm commands are the only controls in headless mode
+        alerts = self.alerts[result["stream_id"]]
+        alerts.armed = self.bot.is_armed
+        alerts.process(result)
+
+    def run(self, stats_interval=60.0):
+        """Runs until stop() is called (SIGINT / SIGTERM)."""
+        self.pipeline.start()
+        logger.info(f"✅ FESS headless service running ({len(self.cameras)} camera(s))")
+
+        wait = stats_interval if stats_interval > 0 else None
+        while not self.stop_event.wait(wait):
+            stats = self.pipeline.stats
+            logger.info(
+                f"Pipeline: {stats['inferred_frames']} frames inferred, "
+                f"{stats['skipped_frames']} skipped (motion gate), "
+                f"last inference {stats['inference_ms']:.0f} ms, "
+                f"{stats['decision_drops']} decision drops, "
+                f"evidence queue {self.evidence.depth} ({self.evidence.stats['dropped_frames']} frames dropped)"
+            )
+            telegram = self.bot.stats
+            logger.info(
+                f"Telegram: {telegram['sent']} alerts sent in {telegram['batches']} messages, "
+                f"queue {self.bot.queue_depth}, latency {telegram['latency_avg']:.1f} s avg / "
+                f"{telegram['latency_max']:.1f} s max, {telegram['retries']} retries, "
+                f"{telegram['failed']} failed, {telegram['dropped']} dropped"
+            )
+            for stream_id, camera in self.cameras.items():
+                health = camera.health()
+                if health["state"] != "streaming":
+                    logger.warning(f"Camera {stream_id}: {health}")
+
+        self.shutdown()
+
+    def stop(self, *args):
+        self.stop_event.set()
+
+    def shutdown(self):
+        logger.info("Stopping headless service...")
+        self.pipeline.stop()
+        self.detector.close()
+        for camera in self.cameras.values():
+            camera.release()
+        for alerts in self.alerts.values():
+            alerts.close()
+        self.evidence.close()
+        self.bot.flush()
+        logger.info("Headless service stopped.")
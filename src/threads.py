@@ -0,0 +1,69 @@
+import os
+import cv2
+from src.config import CPU_AFFINITY, INFERENCE_THREADS, OPENCV_THREADS, logger
+
+_affinity_warned = False
+
+
+def parse_cpus(spec):
+    """'0,2-3' -> [0, 2, 3] (empty spec -> [])"""
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def stage_cpus(stage):
+    """CPUs a pipeline stage is pinned to (CPU_AFFINITY in config.py), or [] for no pinning."""
+    return parse_cpus(CPU_AFFINITY.get(stage, ""))
+
+
+def pin_cpus(cpus, name):
+    """Pins the calling thread to a set of CPUs (threads it starts afterwards inherit the mask)."""
+    global _affinity_warned
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        if not _affinity_warned:
+            logger.warning("CPU affinity is only supported on Linux; CPU_AFFINITY_* settings are ignored.")
+            _affinity_warned = True
+        return
+    try:
+        # pid 0 = the calling thread on Linux
+        os.sched_setaffinity(0, cpus)
+        logger.debug(f"Pinned {name} to CPUs {cpus}")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not pin {name} to CPUs {cpus}: {e}")
+
+
+def pin_current_thread(stage):
+    """Pins the calling thread to its stage's CPUs (capture, inference, decision, face, evidence)."""
+    pin_cpus(stage_cpus(stage), f"{stage} stage")
+
+
+def configure_threads():
+    """
+    Applies the process-wide thread settings. Call once at startup, before
+    the model is loaded and any stage thread starts.
+    """
+    import torch  # Only needed here: capture / face threads pin CPUs without loading torch
+
+    if OPENCV_THREADS >= 0:
+        cv2.setNumThreads(OPENCV_THREADS)
+    if INFERENCE_THREADS > 0:
+        torch.set_num_threads(INFERENCE_THREADS)
+        try:
+            # Batched streams are already parallel at the pipeline level
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Only settable before the first parallel torch op
+    pinned = {stage: stage_cpus(stage) for stage in CPU_AFFINITY}
+    affinity = "".join(f", {stage} CPUs {cpus}" for stage, cpus in pinned.items() if cpus)
+    logger.info(f"Threads: inference {torch.get_num_threads()}, OpenCV {cv2.getNumThreads()}{affinity}")
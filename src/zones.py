@@ -0,0 +1,122 @@
+import functools
+import cv2
+import numpy as np
+from src.config import ZONE_CACHE_SIZE
+
+# Status ordering (a person / frame takes the highest level of the zones entered)
+SEVERITY_LEVELS = {"SAFE": 0, "WARNING": 1, "CRITICAL": 2}
+ZONE_COLORS = {"WARNING": (0, 165, 255), "CRITICAL": (255, 0, 0)}  # BGR
+
+MAX_ZONES = 16  # One bit per zone in the raster mask (uint16)
+
+
+def zone_key(roi):
+    """
+    Normalizes an ROI definition into a hashable zone tuple.
+
+    Accepts either a list of normalized (x, y) points (single "Restricted Area"
+    CRITICAL zone, as in ROI_POINTS) or a list of zone dicts
+    {"name": str, "points": [(x, y), ...], "severity": "CRITICAL" | "WARNING"}.
+
+    Returns:
+        tuple: ((name, ((x, y), ...), severity), ...)
+    """
+    if roi and not isinstance(roi[0], dict):
+        roi = [{"name": "Restricted Area", "points": roi, "severity": "CRITICAL"}]
+
+    return tuple(
+        (
+            zone.get("name", f"Zone {i + 1}"),
+            tuple((float(x), float(y)) for x, y in zone["points"]),
+            zone.get("severity", "CRITICAL")
+        )
+        for i, zone in enumerate(roi)
+    )
+
+
+class ZoneMask:
+    """
+    Zone set compiled for one frame size: a raster mask holding one bit per
+    zone, so zone membership of any pixel is a single array index.
+    """
+
+    def __init__(self, zones, width, height):
+        if len(zones) > MAX_ZONES:
+            raise ValueError(f"At most {MAX_ZONES} zones per camera are supported (got {len(zones)})")
+
+        self.zones = zones
+        self.width = width
+        self.height = height
+
+        self.names = [name for name, _, _ in zones]
+        self.severity_names = [severity for _, _, severity in zones]
+        self.severities = np.array([SEVERITY_LEVELS[severity] for severity in self.severity_names], dtype=np.uint8)
+        self.polygons = [
+            np.array([(int(x * width), int(y * height)) for x, y in points], dtype=np.int32)
+            for _, points, _ in zones
+        ]
+
+        dtype = np.uint8 if len(zones) <= 8 else np.uint16
+        self.mask = np.zeros((height, width), dtype=dtype)
+        layer = np.zeros((height, width), dtype=dtype)
+        for bit, polygon in enumerate(self.polygons):
+            layer.fill(0)
+            cv2.fillPoly(layer, [polygon], 1 << bit)
+            self.mask |= layer
+
+    def lookup(self, pixels):
+        """
+        Args:
+            pixels (ndarray): [..., 2] integer pixel coordinates (x, y)
+
+        Returns:
+            ndarray: Zone bits per point (0 outside every zone or the frame)
+        """
+        x = pixels[..., 0]
+        y = pixels[..., 1]
+        in_frame = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        bits = self.mask[np.clip(y, 0, self.height - 1), np.clip(x, 0, self.width - 1)]
+        return np.where(in_frame, bits, 0)
+
+    def severity(self, bits):
+        """Highest severity level of the zones set in each bitmask ([N] -> [N] uint8)."""
+        if not self.zones:
+            return np.zeros(len(bits), dtype=np.uint8)
+        entered = (bits[:, None] >> np.arange(len(self.zones))) & 1
+        return (entered * self.severities).max(axis=1)
+
+    def zone_names(self, bits):
+        """Names of the zones set in one bitmask."""
+        return [name for i, name in enumerate(self.names) if bits >> i & 1]
+
+
+@functools.lru_cache(maxsize=ZONE_CACHE_SIZE)
+def _zone_bounds(zones, margin):
+    if not zones:
+        return None
+    points = np.array([point for _, zone_points, _ in zones for point in zone_points], dtype=np.float64)
+    x1, y1 = np.clip(points.min(axis=0) - margin, 0.0, 1.0)
+    x2, y2 = np.clip(points.max(axis=0) + margin, 0.0, 1.0)
+    return float(x1), float(y1), float(x2), float(y2)
+
+
+def zone_bounds(roi, margin=0.0):
+    """
+    Returns the normalized bounding box (x1, y1, x2, y2) of all zones,
+    expanded by `margin` and clipped to the frame, or None without zones.
+    """
+    return _zone_bounds(zone_key(roi), margin)
+
+
+@functools.lru_cache(maxsize=ZONE_CACHE_SIZE)
+def _compile_zones(zones, width, height):
+    return ZoneMask(zones, width, height)
+
+
+def get_zone_mask(roi, width, height):
+    """
+    Returns the compiled ZoneMask for an ROI definition and frame size.
+    Masks are cached, so they are only rebuilt when the zones or the
+    resolution change.
+    """
+    return _compile_zones(zone_key(roi), width, height)